@@ -3,42 +3,64 @@
 
 import json
 import argparse
-import requests
 import sys
 from urllib.parse import urlparse
-import time
-import urllib3
+from spec_cache import SpecCache, spec_digest
 
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+# requests/urllib3 are imported lazily so that importing this module (e.g. for
+# detect_public_endpoints) or printing --help stays fast.
+
+def log(message):
+    """Print message as one write, so lines from concurrent sweep workers don't interleave."""
+    sys.stdout.write(message + "\n")
+    sys.stdout.flush()
+
+def create_session():
+    """Create a pooled requests session with TLS warnings silenced"""
+    import requests
+    import urllib3
+
+    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+    return requests.Session()
+
+def fetch_swagger(url, session=None):
+    """Download the raw Swagger/OpenAPI spec body from URL"""
+    import requests
 
-def download_swagger(url):
-    """Download Swagger/OpenAPI spec from URL"""
     try:
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
-        response = requests.get(url, headers=headers, timeout=10, verify=False)
+        response = (session or requests).get(url, headers=headers, timeout=10, verify=False)
         response.raise_for_status()
-        
-        # Try to parse as JSON
-        try:
-            return response.json()
-        except json.JSONDecodeError:
-            # If not JSON, might be YAML
-            try:
-                import yaml
-                return yaml.safe_load(response.text)
-            except ImportError:
-                print(f"Warning: YAML support not available. Install PyYAML for YAML support.")
-                return None
-            except yaml.YAMLError:
-                print(f"Error: Unable to parse response as JSON or YAML from {url}")
-                return None
-                
+        return response.content
     except requests.exceptions.RequestException as e:
-        print(f"Error downloading {url}: {e}")
+        log(f"Error downloading {url}: {e}")
         return None
 
+def parse_swagger(content, url):
+    """Parse a raw spec body as JSON, falling back to YAML"""
+    try:
+        return json.loads(content)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        # If not JSON, might be YAML
+        try:
+            import yaml
+            return yaml.safe_load(content)
+        except ImportError:
+            log("Warning: YAML support not available. Install PyYAML for YAML support.")
+            return None
+        except yaml.YAMLError:
+            log(f"Error: Unable to parse response as JSON or YAML from {url}")
+            return None
+
+def download_swagger(url, session=None):
+    """Download Swagger/OpenAPI spec from URL"""
+    content = fetch_swagger(url, session)
+    if content is None:
+        return None
+    return parse_swagger(content, url)
+
 def detect_public_endpoints(spec_data):
     """Detect public endpoints from Swagger/OpenAPI spec data"""
     if not spec_data:
@@ -71,21 +93,37 @@ def detect_public_endpoints(spec_data):
 
     return public_endpoints
 
-def process_url(url, silent=False):
-    """Process a single URL and return results"""
+def process_url(url, silent=False, session=None, spec_cache=None):
+    """Process a single URL and return (url, public endpoints, spec digest)"""
     if not silent:
-        print(f"Processing: {url}")
+        log(f"Processing: {url}")
+    
+    content = fetch_swagger(url, session)
+    if content is None:
+        if not silent:
+            log(f"Failed to download or parse: {url}")
+        return url, [], None
     
-    spec_data = download_swagger(url)
+    # Identical spec bodies are parsed and analyzed only once per run
+    digest = spec_digest(content)
+    entry = spec_cache.get(digest) if spec_cache is not None else None
+    if entry is None:
+        spec_data = parse_swagger(content, url)
+        entry = (spec_data, detect_public_endpoints(spec_data) if spec_data else [])
+        if spec_cache is not None:
+            spec_cache.put(digest, entry)
+    if spec_cache is not None:
+        spec_cache.add_url(digest, url)
+    
+    spec_data, public_endpoints = entry
     if not spec_data:
         if not silent:
-            print(f"Failed to download or parse: {url}")
-        return url, []
+            log(f"Failed to download or parse: {url}")
+        return url, [], digest
     
-    public_endpoints = detect_public_endpoints(spec_data)
-    return url, public_endpoints
+    return url, public_endpoints, digest
 
-def format_output(url, endpoints, silent=False, separator="-----"):
+def format_output(url, endpoints, silent=False, separator="-----", shared=1, verification=None):
     """Format output for a single URL"""
     output_lines = []
     
@@ -100,11 +138,17 @@ def format_output(url, endpoints, silent=False, separator="-----"):
                 output_lines.append(f"  {method} {endpoint}")
         else:
             output_lines.append("  No public endpoints found.")
+        if shared > 1:
+            output_lines.append(f"  ({shared} URLs share this spec)")
+        if verification is not None:
+            from verify_public import format_verification
+            
+            output_lines.append(format_verification(verification, endpoints))
         output_lines.append(separator)
     
     return "\n".join(output_lines)
 
-def main():
+def main(argv=None):
     parser = argparse.ArgumentParser(description="Detect public (unauthenticated) endpoints in Swagger/OpenAPI specs")
     
     # URL options
@@ -116,7 +160,41 @@ def main():
     parser.add_argument('-silent', '--silent', action='store_true', 
                        help='Silent mode: only output URLs with public endpoints')
     
-    args = parser.parse_args()
+    # DNS options
+    parser.add_argument('--no-resolve', action='store_true',
+                       help='Disable concurrent DNS pre-resolution of target hostnames')
+    parser.add_argument('--dns-workers', type=int, default=64,
+                       help='Number of concurrent DNS lookups during pre-resolution (default: 64)')
+    parser.add_argument('--dns-ttl', type=int, default=300,
+                       help='Seconds to cache resolved hostnames (default: 300)')
+    parser.add_argument('--spec-cache-size', type=int, default=256,
+                       help='Number of distinct specs to keep parsed for deduplication (default: 256)')
+    
+    # Scheduling options
+    parser.add_argument('--workers', type=int, default=8,
+                       help='Spec URLs fetched concurrently across hosts (default: 8)')
+    parser.add_argument('--host-concurrency', type=int, default=1,
+                       help='Spec URLs fetched concurrently from one host (default: 1)')
+    parser.add_argument('--host-delay', type=float, default=0.5,
+                       help='Minimum seconds between requests to the same host (default: 0.5)')
+    parser.add_argument('--no-prioritize', action='store_true',
+                       help='Process URLs in file order instead of by likelihood of a finding')
+    parser.add_argument('--no-history', action='store_true',
+                       help='Neither use nor update the hit history kept from previous sweeps')
+    
+    # Verification options
+    parser.add_argument('--verify', action='store_true',
+                       help='Probe endpoints without credentials to verify which are actually public')
+    parser.add_argument('--verify-methods', default='GET,HEAD,OPTIONS',
+                       help='Comma-separated HTTP methods allowed when probing (default: GET,HEAD,OPTIONS)')
+    parser.add_argument('--verify-workers', type=int, default=32,
+                       help='Concurrent probes across all hosts (default: 32)')
+    parser.add_argument('--per-host-limit', type=int, default=4,
+                       help='Concurrent probes per host (default: 4)')
+    parser.add_argument('--verify-timeout', type=float, default=5,
+                       help='Timeout in seconds for each probe (default: 5)')
+    
+    args = parser.parse_args(argv)
     
     # Validate arguments
     if not args.url and not args.file:
@@ -145,41 +223,118 @@ def main():
         print("No URLs to process")
         sys.exit(1)
     
-    # Process URLs
+    # Normalize URLs, adding protocol if missing
+    targets = []
+    for url in urls:
+        url_clean = url.strip()
+        if not url_clean:
+            continue
+        if not url_clean.startswith(('http://', 'https://')):
+            url_clean = 'https://' + url_clean
+        targets.append(url_clean)
+    
+    # Resolve all unique hostnames up front and drop the ones that don't resolve
+    if not args.no_resolve:
+        from dns_cache import DNSCache, install_connection_hook
+        
+        dns_cache = DNSCache(ttl=args.dns_ttl, workers=args.dns_workers)
+        dns_cache.resolve_all(urlparse(url).hostname for url in targets)
+        install_connection_hook(dns_cache)
+        
+        live_targets = [url for url in targets if not dns_cache.is_dead(urlparse(url).hostname)]
+        if not args.silent and len(live_targets) != len(targets):
+            print(f"Skipping {len(targets) - len(live_targets)} URL(s) with unresolvable hostnames")
+        targets = live_targets
+    
+    # Process URLs over a shared connection pool
     all_results = []
     urls_with_results = []
+    session = create_session()
+    # Hosts are interleaved, so keep a pool per host instead of requests' default of 10
+    from requests.adapters import HTTPAdapter
     
-    for url in urls:
-        try:
-            url_clean = url.strip()
-            if not url_clean:
+    adapter = HTTPAdapter(pool_connections=max(10, len({urlparse(url).netloc for url in targets})),
+                          pool_maxsize=args.host_concurrency)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    # Any response at all, whatever its status, shows the host is alive
+    answered = set()
+    session.hooks["response"].append(lambda response, *args, **kwargs: answered.add(urlparse(response.url).netloc))
+    spec_cache = SpecCache(maxsize=args.spec_cache_size)
+    processed = []
+    verifier = None
+    if args.verify:
+        from verify_public import PublicVerifier
+        
+        verifier = PublicVerifier(workers=args.verify_workers, per_host=args.per_host_limit,
+                                  timeout=args.verify_timeout, methods=args.verify_methods.split(','))
+    
+    from sweep_scheduler import HitHistory, SweepScheduler
+    
+    # Likely hits first, spread over hosts; the per-host delay keeps the sweep respectful
+    history = None if args.no_history else HitHistory()
+    scheduler = SweepScheduler(targets, history, per_host=args.host_concurrency,
+                               host_delay=args.host_delay, prioritize=not args.no_prioritize)
+    target_order = {url: index for index, url in reversed(list(enumerate(targets)))}
+    # Silent hits are printed as soon as they are found
+    stream = args.silent and not args.output and not verifier
+    
+    def sweep(url_clean):
+        processed_url, endpoints, digest = process_url(url_clean, args.silent, session, spec_cache)
+        
+        # Probes run in the background while the sweep continues
+        probes = None
+        entry = spec_cache.get(digest) if verifier and digest else None
+        if entry and entry[0]:
+            probes = verifier.submit(entry[0], processed_url)
+        return endpoints, digest, probes
+    
+    try:
+        for url_clean, result, error in scheduler.run(sweep, args.workers):
+            if error is not None:
+                if not args.silent:
+                    print(f"Error processing {url_clean}: {error}")
+                scheduler.complete(url_clean, urlparse(url_clean).netloc in answered, False)
                 continue
-                
-            # Add protocol if missing
-            if not url_clean.startswith(('http://', 'https://')):
-                url_clean = 'https://' + url_clean
             
-            processed_url, endpoints = process_url(url_clean, args.silent)
-            
-            if endpoints or not args.silent:
-                result_output = format_output(processed_url, endpoints, args.silent, 
-                                            separator="#####" if args.file else "-----")
-                all_results.append(result_output)
-                
-                if endpoints:
-                    urls_with_results.append(processed_url)
-            
-            # Small delay to be respectful
-            if len(urls) > 1:
-                time.sleep(0.5)
-                
-        except KeyboardInterrupt:
-            print("\nOperation cancelled by user")
-            break
-        except Exception as e:
-            if not args.silent:
-                print(f"Error processing {url}: {e}")
+            endpoints, digest, probes = result
+            scheduler.complete(url_clean, urlparse(url_clean).netloc in answered, bool(endpoints))
+            if stream and endpoints:
+                log(url_clean)
+            if endpoints or probes or not args.silent:
+                processed.append((url_clean, endpoints, digest, probes))
+    except KeyboardInterrupt:
+        print("\nOperation cancelled by user")
+    
+    if history is not None:
+        history.save()
+    
+    # Format in input order once all URLs are processed so shared spec counts are final
+    processed.sort(key=lambda item: target_order[item[0]])
+    for processed_url, endpoints, digest, probes in processed:
+        verification = None
+        if probes is not None:
+            verification = [future.result() for future in probes]
+            # With verification, a URL counts as a hit only if something answered without auth
+            endpoints_found = any(r["classification"] == "open" for r in verification)
+        else:
+            endpoints_found = bool(endpoints)
+        
+        if endpoints_found:
+            urls_with_results.append(processed_url)
+        
+        if args.silent:
+            if endpoints_found and not stream:
+                all_results.append(processed_url)
             continue
+        
+        result_output = format_output(processed_url, endpoints, args.silent,
+                                    separator="#####" if args.file else "-----",
+                                    shared=spec_cache.share_count(digest), verification=verification)
+        all_results.append(result_output)
+    
+    if verifier:
+        verifier.shutdown()
     
     # Output results
     final_output = "\n".join(all_results)
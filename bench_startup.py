@@ -0,0 +1,99 @@
+# python3 bench_startup.py
+# python3 bench_startup.py -n 30 --specs 200
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+ENTRY_POINTS = [
+    ["api_endpoints_without_auth.py", "-h"],
+    ["openapi_parse_v1.py", "-h"],
+    ["swagger_v1.py", "-h"],
+    ["detect_public_endpoints.py", "-h"],
+    ["rest_api_scanning.py", "-h"],
+    ["rest_api_scanning.py", "detect", "-h"],
+    ["rest_api_scanning.py", "sweep", "-h"],
+]
+
+SAMPLE_SPEC = {
+    "swagger": "2.0",
+    "info": {"title": "bench", "version": "1"},
+    "securityDefinitions": {"key": {"type": "apiKey", "name": "X-API-Key", "in": "header"}},
+    "paths": {f"/items/{i}": {"get": {"security": []}, "post": {}} for i in range(20)},
+}
+
+# Small OpenAPI 3 document for full generation runs
+SAMPLE_OPENAPI = {
+    "openapi": "3.0.3",
+    "info": {"title": "bench", "version": "1"},
+    "paths": {f"/items/{{id}}/sub{i}": {
+        "get": {"parameters": [{"name": "id", "in": "path", "required": True, "schema": {"type": "string"}}],
+                "responses": {"200": {"description": "ok"}}},
+        "post": {"requestBody": {"content": {"application/json": {"schema": {
+                    "type": "object", "properties": {"name": {"type": "string"}}}}}},
+                 "responses": {"200": {"description": "ok"}}},
+    } for i in range(20)},
+}
+
+def time_command(cmd, runs, cwd=HERE):
+    """Median wall time in milliseconds of running cmd `runs` times."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(cmd, cwd=cwd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-invocation startup time of the CLI entry points")
+    parser.add_argument('-n', '--runs', type=int, default=15, help='Runs per command (default: 15)')
+    parser.add_argument('--specs', type=int, default=100, help='Number of specs for the loop vs batch comparison (default: 100)')
+    args = parser.parse_args()
+
+    print("Startup (median of %d runs):" % args.runs)
+    for entry in ENTRY_POINTS:
+        print(f"  {' '.join(entry):45s} {time_command([sys.executable] + entry, args.runs):8.1f} ms")
+
+    # Real generation runs: parse, validate and render a spec file. Only
+    # these pay for validation (--validate fast imports jsonschema).
+    with tempfile.TemporaryDirectory() as tmp:
+        spec_path = os.path.join(tmp, "openapi.json")
+        with open(spec_path, 'w') as f:
+            json.dump(SAMPLE_OPENAPI, f)
+        print("\nGeneration run on a 40-operation spec (median of %d runs):" % args.runs)
+        for mode in ("off", "fast"):
+            cmd = [sys.executable, os.path.join(HERE, "openapi_parse_v1.py"), "--file", spec_path,
+                   "--host", "example.com", "--validate", mode]
+            print(f"  {'openapi_parse_v1.py --validate ' + mode:45s} {time_command(cmd, args.runs, cwd=tmp):8.1f} ms")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(args.specs):
+            path = os.path.join(tmp, f"spec_{i}.json")
+            with open(path, 'w') as f:
+                json.dump(SAMPLE_SPEC, f)
+            paths.append(path)
+
+        start = time.perf_counter()
+        for path in paths:
+            subprocess.run([sys.executable, "detect_public_endpoints.py", "--swagger", path],
+                           cwd=HERE, stdout=subprocess.DEVNULL)
+        loop_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "rest_api_scanning.py", "batch"], cwd=HERE,
+                       input="\n".join(paths), text=True, stdout=subprocess.DEVNULL)
+        batch_time = time.perf_counter() - start
+
+    print(f"\n{args.specs} specs, one process each: {loop_time:8.2f} s")
+    print(f"{args.specs} specs, batch mode:          {batch_time:8.2f} s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# python3 bench_sweep.py
+# python3 bench_sweep.py --hosts 50 --hit-hosts 5 --latency 0.05
+
+import argparse
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+from standin_server import StandinServer
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Candidate paths per host, as a spec-discovery wordlist would produce them
+CANDIDATE_PATHS = [
+    "/", "/index.html", "/robots.txt", "/api", "/api/v1/users", "/docs", "/swagger-ui.html",
+    "/api/swagger.json", "/v2/api-docs", "/v3/api-docs", "/swagger.json", "/openapi.json",
+]
+
+EMPTY_SPEC = {"swagger": "2.0", "info": {"title": "empty", "version": "1"}, "paths": {}}
+
+def closed_port():
+    """A local port with nothing listening (connections are refused)."""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def build_targets(args, rng):
+    """Start the stand-in hosts and return (servers, target URLs in worst-case file order)."""
+    servers = []
+    hosts = []
+    for i in range(args.hosts):
+        if i < args.dead_hosts:
+            hosts.append((f"http://127.0.0.1:{closed_port()}", False))
+            continue
+        hit = i >= args.hosts - args.hit_hosts
+        server = StandinServer(("127.0.0.1", 0), None if hit else EMPTY_SPEC, args.latency)
+        server.start()
+        servers.append(server)
+        hosts.append((server.base_url, hit))
+
+    # Shuffle, then push the hosts with findings to the end of the file
+    rng.shuffle(hosts)
+    hosts.sort(key=lambda host: host[1])
+    targets = []
+    for base_url, _ in hosts:
+        paths = CANDIDATE_PATHS[:]
+        rng.shuffle(paths)
+        targets.extend(base_url + path for path in paths)
+    return servers, targets
+
+def run_sweep(targets_file, options, env):
+    """Run a silent sweep; return (seconds to first finding, total seconds, findings)."""
+    cmd = [sys.executable, os.path.join(HERE, "api_endpoints_without_auth.py"), "-f", targets_file,
+           "-silent", "--no-resolve"] + options
+    start = time.perf_counter()
+    first = None
+    findings = 0
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, env=env) as proc:
+        for line in proc.stdout:
+            if line.startswith("http"):
+                findings += 1
+                first = first or time.perf_counter() - start
+    return first, time.perf_counter() - start, findings
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sweep ordering on a synthetic target set of local stand-in hosts")
+    parser.add_argument('--hosts', type=int, default=30, help='Number of hosts (default: 30)')
+    parser.add_argument('--hit-hosts', type=int, default=3, help='Hosts serving a spec with public endpoints (default: 3)')
+    parser.add_argument('--dead-hosts', type=int, default=3, help='Hosts refusing connections (default: 3)')
+    parser.add_argument('--latency', type=float, default=0.02, help='Stand-in response latency in seconds (default: 0.02)')
+    parser.add_argument('--host-delay', type=float, default=0.2, help='Per-host delay used in every run (default: 0.2)')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed for the target order (default: 1)')
+    args = parser.parse_args()
+
+    servers, targets = build_targets(args, random.Random(args.seed))
+    print(f"{len(targets)} URLs on {args.hosts} hosts ({args.hit_hosts} with findings, {args.dead_hosts} dead), "
+          f"{args.latency * 1000:.0f} ms latency")
+
+    delay = ["--host-delay", str(args.host_delay)]
+    runs = [
+        ("file order, 1 worker", ["--workers", "1", "--no-prioritize", "--no-history"] + delay),
+        ("prioritized, 1 worker", ["--workers", "1", "--no-history"] + delay),
+        ("prioritized, 1 worker, history", ["--workers", "1"] + delay),
+        ("prioritized, 8 workers", ["--workers", "8", "--no-history"] + delay),
+        ("prioritized, 8 workers, history", ["--workers", "8"] + delay),
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        targets_file = os.path.join(tmp, "targets.txt")
+        with open(targets_file, 'w') as f:
+            f.write("\n".join(targets))
+        env = dict(os.environ, REST_API_SCANNING_CACHE=tmp)
+
+        # Seed the hit history with one earlier sweep
+        run_sweep(targets_file, ["--workers", "8"] + delay, env)
+
+        print(f"  {'':34s} {'first finding':>14s} {'total':>9s} {'URLs/s':>8s} {'findings':>9s}")
+        for name, options in runs:
+            first, total, findings = run_sweep(targets_file, options, env)
+            first_text = f"{first:.2f} s" if first is not None else "-"
+            print(f"  {name:34s} {first_text:>14s} {total:8.2f}s {len(targets) / total:8.1f} {findings:9d}")
+
+    for server in servers:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
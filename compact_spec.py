@@ -0,0 +1,226 @@
+import hashlib
+import json
+import marshal
+import mmap
+import os
+import sys
+
+from spec_cache import cache_dir
+
+# Documentation strings are blanked rather than removed, so required fields
+# (e.g. a response's description) still validate.
+BLANKED_KEYS = {"description", "summary"}
+
+DROPPED_KEYS = {"examples", "externalDocs"}
+
+# "example" is read by the body generators when it sits in a schema; it is only
+# dropped from objects that carry a "schema" (parameters, media types, headers)
+DOCUMENTATION_EXAMPLE = "example"
+
+# Keys whose value maps names to objects: there an "x-" key is a name
+# (a property, a security scheme), not a specification extension
+NAME_MAP_KEYS = {
+    "properties", "patternProperties", "definitions", "$defs", "dependentSchemas", "paths",
+    "parameters", "responses", "headers", "securityDefinitions", "securitySchemes", "schemas",
+    "requestBodies", "pathItems", "links", "callbacks", "content", "encoding", "variables",
+    "scopes", "mapping",
+}
+
+# Keys whose value is data or a map of names, never an object with extensions
+OPAQUE_KEYS = {"example", "examples", "default", "enum", "const", "security"}
+
+# Top-level sections that no generator or detector reads
+DROPPED_SECTIONS = {"tags", "externalDocs"}
+DROPPED_COMPONENTS = {"examples", "links", "callbacks"}
+
+SCHEMA_KEYS = {"type", "$ref", "properties", "items", "allOf", "oneOf", "anyOf", "enum", "format"}
+
+# Short string values (enum members, types, formats, param names) repeat a lot
+INTERN_MAX_LENGTH = 64
+
+# Part of the binary cache key; bump when the compacted form changes
+COMPACT_FORMAT = 3
+
+_EMPTY = sys.intern("")
+
+def _looks_like_schema(value):
+    return isinstance(value, dict) and not SCHEMA_KEYS.isdisjoint(value)
+
+def _make_object_hook():
+    """Build an object_pairs_hook for one load.
+
+    The hook interns keys and short strings and drops documentation-only data.
+    Specification extensions need to know their position, so they are
+    dropped afterwards by strip_extensions().
+    Leaf objects with only scalar values are hash-consed: identical ones like
+    {"type": "string"} become one shared dict, so the result must be treated
+    as read-only.
+    """
+    intern = sys.intern
+    shared = {}
+
+    def hook(pairs):
+        obj = {}
+        leaf = True
+        for key, value in pairs:
+            if key in BLANKED_KEYS and isinstance(value, str):
+                value = _EMPTY
+            # A property may legitimately be named "example": keep it if it's a schema
+            elif key in DROPPED_KEYS and not _looks_like_schema(value):
+                continue
+            elif type(value) is str and len(value) <= INTERN_MAX_LENGTH:
+                value = intern(value)
+            elif isinstance(value, (dict, list)):
+                leaf = False
+            obj[intern(key)] = value
+        if "schema" in obj and DOCUMENTATION_EXAMPLE in obj and not _looks_like_schema(obj[DOCUMENTATION_EXAMPLE]):
+            del obj[DOCUMENTATION_EXAMPLE]
+        if not leaf:
+            return obj
+        # Include value types so {"a": 1} and {"a": true} stay distinct
+        return shared.setdefault(tuple((k, type(v), v) for k, v in obj.items()), obj)
+
+    return hook
+
+def _collect_refs(node, refs):
+    """Add every $ref under node to refs, plus discriminator mapping targets.
+
+    A mapping value is either a reference ("#/components/schemas/Dog") or,
+    per OpenAPI 3, a bare schema name ("Dog").
+    """
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            ref = node.get("$ref")
+            if isinstance(ref, str):
+                refs.add(ref)
+            discriminator = node.get("discriminator")
+            if isinstance(discriminator, dict) and isinstance(discriminator.get("mapping"), dict):
+                for target in discriminator["mapping"].values():
+                    if isinstance(target, str):
+                        refs.add(target if "/" in target else "#/components/schemas/" + target)
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+
+def prune_unreferenced(spec):
+    """Remove schemas (definitions / components.schemas) that no operation reaches."""
+    schemas = spec.get("definitions")
+    prefix = "#/definitions/"
+    if not isinstance(schemas, dict):
+        schemas = spec.get("components", {}).get("schemas")
+        prefix = "#/components/schemas/"
+    if not isinstance(schemas, dict):
+        return spec
+
+    # Roots: everything except the schema table itself
+    refs = set()
+    for key, value in spec.items():
+        if key == "definitions":
+            continue
+        if key == "components":
+            _collect_refs({k: v for k, v in value.items() if k != "schemas"}, refs)
+        else:
+            _collect_refs(value, refs)
+
+    reachable = set()
+    pending = [ref[len(prefix):] for ref in refs if ref.startswith(prefix)]
+    while pending:
+        name = pending.pop()
+        if name in reachable or name not in schemas:
+            continue
+        reachable.add(name)
+        nested = set()
+        _collect_refs(schemas[name], nested)
+        pending.extend(ref[len(prefix):] for ref in nested if ref.startswith(prefix))
+
+    for name in [name for name in schemas if name not in reachable]:
+        del schemas[name]
+    return spec
+
+def strip_extensions(spec):
+    """Drop "x-" specification extensions in place.
+
+    Only keys of spec objects are extensions. Keys of name maps (see
+    NAME_MAP_KEYS) are names such as a property or an apiKey header called
+    x-api-key, and example/default/enum values and security requirements
+    are left untouched. Objects are replaced rather than edited, since the
+    loader shares identical leaf objects.
+    """
+    stack = [(None, None, spec, False)]
+    while stack:
+        parent, key, node, is_map = stack.pop()
+        if isinstance(node, list):
+            stack.extend((node, index, item, False) for index, item in enumerate(node))
+            continue
+        if not isinstance(node, dict):
+            continue
+        if not is_map and any(k.startswith("x-") for k in node):
+            if parent is None:
+                for k in [k for k in node if k.startswith("x-")]:
+                    del node[k]
+            else:
+                node = parent[key] = {k: v for k, v in node.items() if not k.startswith("x-")}
+        for k, v in node.items():
+            if is_map:
+                stack.append((node, k, v, False))
+            elif k not in OPAQUE_KEYS:
+                stack.append((node, k, v, k in NAME_MAP_KEYS))
+    return spec
+
+def compact(spec):
+    """Drop extensions, unused top-level sections and unreferenced schemas in place."""
+    strip_extensions(spec)
+    for key in DROPPED_SECTIONS:
+        spec.pop(key, None)
+    components = spec.get("components")
+    if isinstance(components, dict):
+        for key in DROPPED_COMPONENTS:
+            components.pop(key, None)
+    return prune_unreferenced(spec)
+
+def loads_compact(text):
+    """Parse a JSON spec string in compact form."""
+    return compact(json.loads(text, object_pairs_hook=_make_object_hook()))
+
+def _binary_path(file_path):
+    stat = os.stat(file_path)
+    key = f"{os.path.abspath(file_path)}:{stat.st_size}:{stat.st_mtime_ns}:{sys.version_info[:2]}:{COMPACT_FORMAT}"
+    return os.path.join(cache_dir("compact"), hashlib.sha256(key.encode()).hexdigest() + ".marshal")
+
+def _load_binary(path):
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return marshal.loads(mapped)
+
+def load_compact(file_path, use_cache=False):
+    """Load a JSON spec file in compact form.
+
+    With use_cache, the compacted spec is also stored as a marshal file in the
+    on-disk cache. Later runs memory-map it instead of re-parsing the JSON. The
+    cache entry is keyed by path, size, mtime and Python version.
+    """
+    binary_path = _binary_path(file_path) if use_cache else None
+    if binary_path and os.path.exists(binary_path):
+        try:
+            return _load_binary(binary_path)
+        except (ValueError, EOFError, TypeError, OSError):
+            pass
+
+    with open(file_path, 'r', encoding='utf-8') as f:
+        spec = compact(json.load(f, object_pairs_hook=_make_object_hook()))
+
+    if binary_path:
+        tmp_path = binary_path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            marshal.dump(spec, f)
+        os.replace(tmp_path, binary_path)
+    return spec
+
+def load_spec(file_path, compact_mode=False, use_cache=False):
+    """Load a JSON spec file, in compact form if requested."""
+    if compact_mode or use_cache:
+        return load_compact(file_path, use_cache)
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
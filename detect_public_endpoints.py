@@ -4,7 +4,9 @@ import argparse
 def detect_public_endpoints(swagger_file):
     with open(swagger_file, 'r', encoding='utf-8') as f:
         spec = json.load(f)
+    return find_public_endpoints(spec)
 
+def find_public_endpoints(spec):
     paths = spec.get("paths", {})
     security_definitions = spec.get("securityDefinitions", None)
     global_security = spec.get("security", None)
@@ -30,11 +32,12 @@ def detect_public_endpoints(swagger_file):
 
     return public_endpoints
 
-if __name__ == "__main__":
+def cli(argv=None):
+    """Parse command line arguments and print public endpoints for each file."""
     parser = argparse.ArgumentParser(description="Detect public (unauthenticated) endpoints in Swagger JSON files")
     parser.add_argument('--swagger', nargs='+', required=True, help='Path(s) to Swagger JSON file(s)')
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     for file in args.swagger:
         try:
@@ -47,3 +50,6 @@ if __name__ == "__main__":
                 print("  No public endpoints found.")
         except Exception as e:
             print(f"Error processing {file}: {e}")
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,118 @@
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# getaddrinfo errors that mean the name does not exist (NXDOMAIN) or has no
+# address records, as opposed to a transient failure such as EAI_AGAIN or a
+# resolver timeout. EAI_NODATA is not defined on every platform.
+NEGATIVE_ERRORS = tuple(code for code in (socket.EAI_NONAME, getattr(socket, "EAI_NODATA", None)) if code is not None)
+
+def system_resolver(hostname):
+    """Resolve a hostname with the system resolver and return its unique IP addresses."""
+    infos = socket.getaddrinfo(hostname, None, proto=socket.IPPROTO_TCP)
+    return list(dict.fromkeys(info[4][0] for info in infos))
+
+class DNSCache:
+    """Thread-safe hostname -> IP cache with TTL, including negative answers.
+
+    `resolver` is any callable taking a hostname and returning a list of IP
+    addresses. To report that the name does not exist it must raise
+    `socket.gaierror` with errno EAI_NONAME (or EAI_NODATA where defined);
+    only that is cached as a negative answer. Any other exception (another
+    gaierror, a timeout, OSError) is a transient failure: it is retried up
+    to `retries` times and then left uncached, so the host is kept and the
+    normal resolver is used when connecting. Pass a stub resolver to test
+    without touching the network.
+    """
+
+    def __init__(self, resolver=None, ttl=300, negative_ttl=60, workers=64, retries=2, clock=time.monotonic):
+        self.resolver = resolver or system_resolver
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.workers = workers
+        self.retries = retries
+        self.clock = clock
+        self._entries = {}  # hostname -> (expires_at, [ips])
+        self._lock = threading.Lock()
+
+    def get(self, hostname):
+        """Return cached IPs for hostname, [] for a cached failure, or None if unknown/expired."""
+        with self._lock:
+            entry = self._entries.get(hostname)
+        if entry is None or entry[0] <= self.clock():
+            return None
+        return entry[1]
+
+    def lookup(self, hostname):
+        """Return IPs for hostname, resolving and caching on a miss.
+
+        Returns [] when the name does not exist and None when resolution
+        kept failing for another reason (nothing is cached then).
+        """
+        addresses = self.get(hostname)
+        if addresses is not None:
+            return addresses
+
+        for attempt in range(self.retries + 1):
+            try:
+                addresses = list(self.resolver(hostname))
+                break
+            except socket.gaierror as e:
+                if e.errno in NEGATIVE_ERRORS:
+                    addresses = []
+                    break
+            except UnicodeError:
+                # Not a valid hostname at all, so it can never resolve
+                addresses = []
+                break
+            except OSError:
+                pass
+        else:
+            return None
+
+        ttl = self.ttl if addresses else self.negative_ttl
+        with self._lock:
+            self._entries[hostname] = (self.clock() + ttl, addresses)
+        return addresses
+
+    def resolve_all(self, hostnames):
+        """Resolve all unique hostnames concurrently and return {hostname: [ips] or None}."""
+        unique = list(dict.fromkeys(h for h in hostnames if h))
+        if not unique:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(unique))) as pool:
+            results = pool.map(self.lookup, unique)
+        return dict(zip(unique, results))
+
+    def is_dead(self, hostname):
+        """True if hostname has a cached negative answer."""
+        return self.get(hostname) == []
+
+def install_connection_hook(cache):
+    """Make urllib3 (and therefore requests) connect to IPs from `cache`.
+
+    Only the socket address is replaced, so the Host header and TLS SNI still
+    use the original hostname. Hosts missing from the cache fall back to the
+    normal resolver. Returns the previous create_connection for restoring.
+    """
+    from urllib3.util import connection
+
+    original = connection.create_connection
+
+    def create_connection(address, *args, **kwargs):
+        host, port = address
+        addresses = cache.get(host)
+        if not addresses:
+            return original(address, *args, **kwargs)
+
+        last_error = None
+        for ip in addresses:
+            try:
+                return original((ip, port), *args, **kwargs)
+            except OSError as e:
+                last_error = e
+        raise last_error
+
+    connection.create_connection = create_connection
+    return original
@@ -0,0 +1,409 @@
+# python3 ingest.py --har capture.har --host api.example.com
+# python3 ingest.py --postman collection.json --spec-out postman_openapi.json
+# python3 ingest.py --graphql introspection.json --graphql-path /api/graphql --host api.example.com
+
+import argparse
+import json
+import os
+import re
+import shutil
+import sys
+from urllib.parse import urlencode, urlparse
+
+# Request headers that carry credentials: a capture with one of them is authenticated
+AUTH_HEADERS = {"authorization", "cookie", "x-api-key", "api-key", "x-auth-token", "proxy-authorization"}
+
+# Headers that describe the captured connection rather than the operation.
+# HTTP/2 captures also list pseudo-headers (":authority", ":path", ...), which
+# are skipped by their leading colon.
+SKIPPED_HEADERS = AUTH_HEADERS | {"host", "content-length", "connection", "accept-encoding", "user-agent", "accept"}
+
+STATIC_EXTENSIONS = (".js", ".css", ".png", ".jpg", ".jpeg", ".gif", ".svg", ".ico", ".woff", ".woff2", ".ttf", ".map", ".webp")
+
+def make_operation(method, path, query=None, headers=None, body=None, content_type=None, authenticated=False, operation_id=None):
+    """Build an operation in the shape openapi_parse_v1.build_operation returns.
+
+    authenticated is None when the source says nothing about credentials.
+    """
+    op_headers = {}
+    if body:
+        op_headers["Content-Type"] = content_type or "application/json"
+    for name, value in (headers or {}).items():
+        if name.lower() not in SKIPPED_HEADERS and name.lower() != "content-type" and not name.startswith(":"):
+            op_headers[name] = value
+    return {
+        "operation_id": operation_id,
+        "method": method.upper(),
+        "path": path or "/",
+        "path_values": {},
+        "query": query or None,
+        "headers": op_headers,
+        "body": body or None,
+        "content_type": content_type or "application/json",
+        "authenticated": authenticated,
+    }
+
+# --- HAR ---------------------------------------------------------------------
+
+_ENTRIES_START = re.compile(r'"entries"\s*:\s*\[')
+_SEPARATORS = re.compile(r'[\s,]*')
+_STRUCTURE = re.compile(r'[][{}"]')
+_STRING_SPECIAL = re.compile(r'["\\]')
+
+def _scan_object(text, pos, state):
+    """Look for the end of the JSON object being read in text[pos:].
+
+    state is [depth, in_string, escaped]. It is updated in place, so the scan
+    of one object continues chunk by chunk and no text is scanned twice.
+    Returns the index just past the closing brace, or None if the object
+    continues beyond text.
+    """
+    depth, in_string, escaped = state
+    if escaped:
+        # The escaped character is the first one of this chunk
+        pos += 1
+        escaped = False
+    while True:
+        if in_string:
+            match = _STRING_SPECIAL.search(text, pos)
+            if not match:
+                break
+            if match.group() == "\\":
+                pos = match.end() + 1
+                if pos > len(text):
+                    escaped = True
+                    break
+                continue
+            in_string = False
+        else:
+            match = _STRUCTURE.search(text, pos)
+            if not match:
+                break
+            char = match.group()
+            if char == '"':
+                in_string = True
+            elif char in "{[":
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return match.end()
+        pos = match.end()
+    state[:] = [depth, in_string, escaped]
+    return None
+
+def iter_har_entries(file_path, chunk_size=1 << 20):
+    """Yield HAR log entries one at a time without loading the whole file.
+
+    The file is read in chunks. The end of each element of the "entries" array
+    is found by an incremental scan, and the element is decoded once it is
+    complete. Memory is bounded by the largest single entry, not the capture
+    size, and an entry spanning many chunks is still scanned only once.
+    """
+    decoder = json.JSONDecoder()
+    with open(file_path, 'r', encoding='utf-8') as f:
+        text = ""
+        while True:
+            match = _ENTRIES_START.search(text)
+            if match:
+                text = text[match.end():]
+                break
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            # Keep a tail in case the key straddles two chunks
+            text = text[-32:] + chunk
+
+        pos = 0
+        while True:
+            pos = _SEPARATORS.match(text, pos).end()
+            if pos == len(text):
+                text = f.read(chunk_size)
+                pos = 0
+                if not text:
+                    return
+                continue
+            if text[pos] == "]":
+                return
+            if text[pos] != "{":
+                raise json.JSONDecodeError("Expecting a HAR entry object", text, pos)
+
+            parts = []
+            state = [0, False, False]
+            scan_from = pos
+            while True:
+                end = _scan_object(text, scan_from, state)
+                if end is not None:
+                    break
+                parts.append(text[pos:])
+                text = f.read(chunk_size)
+                pos = scan_from = 0
+                if not text:
+                    # Truncated capture: let the decoder report where
+                    decoder.decode("".join(parts))
+            parts.append(text[pos:end])
+            yield decoder.decode("".join(parts))
+            pos = end
+
+def har_entry_to_operation(entry):
+    """Convert one HAR entry to (operation, host), or None for static assets and non-HTTP entries."""
+    request = entry.get("request", {})
+    url = urlparse(request.get("url", ""))
+    if not url.scheme.startswith("http") or url.path.lower().endswith(STATIC_EXTENSIONS):
+        return None
+    headers = {h.get("name", ""): h.get("value", "") for h in request.get("headers", [])}
+    authenticated = any(name.lower() in AUTH_HEADERS for name in headers)
+    post_data = request.get("postData") or {}
+    body = post_data.get("text")
+    if not body and post_data.get("params"):
+        body = urlencode([(p.get("name", ""), p.get("value", "")) for p in post_data["params"]])
+    return make_operation(request.get("method", "GET"), url.path, url.query, headers, body,
+                          post_data.get("mimeType"), authenticated), url.netloc
+
+def iter_har_operations(file_path):
+    """Yield (operation, host) pairs from a HAR capture."""
+    for entry in iter_har_entries(file_path):
+        converted = har_entry_to_operation(entry)
+        if converted:
+            yield converted
+
+# --- Postman -------------------------------------------------------------------
+
+_POSTMAN_VARIABLE = re.compile(r"^\{\{(.+)\}\}$")
+
+def _postman_path(url):
+    if isinstance(url, str):
+        raw = re.sub(r"\{\{[^}]+\}\}", "", url) if url.startswith("{{") else url
+        parsed = urlparse(raw if "://" in raw else "http://placeholder" + ("" if raw.startswith("/") else "/") + raw)
+        return parsed.path, parsed.query
+    segments = []
+    for segment in url.get("path", []):
+        segment = segment if isinstance(segment, str) else segment.get("value", "")
+        variable = _POSTMAN_VARIABLE.match(segment)
+        if segment.startswith(":"):
+            segment = "{" + segment[1:] + "}"
+        elif variable:
+            segment = "{" + variable.group(1) + "}"
+        segments.append(segment)
+    query = urlencode([(q.get("key", ""), q.get("value") or "") for q in url.get("query", []) if not q.get("disabled")])
+    return "/" + "/".join(segments), query
+
+def _postman_body(body):
+    if not body:
+        return None, None
+    mode = body.get("mode")
+    if mode == "raw":
+        language = body.get("options", {}).get("raw", {}).get("language", "json")
+        return body.get("raw"), "application/json" if language == "json" else "text/plain"
+    if mode == "urlencoded":
+        return urlencode([(p.get("key", ""), p.get("value") or "") for p in body.get("urlencoded", []) if not p.get("disabled")]), "application/x-www-form-urlencoded"
+    if mode == "formdata":
+        parts = [f"--boundary\nContent-Disposition: form-data; name=\"{p.get('key', '')}\"\n\n{p.get('value') or ''}"
+                 for p in body.get("formdata", []) if not p.get("disabled")]
+        return "\n".join(parts) + "\n--boundary--", "multipart/form-data; boundary=boundary"
+    if mode == "graphql":
+        graphql = body.get("graphql", {})
+        variables = graphql.get("variables") or "{}"
+        try:
+            variables = json.loads(variables) if isinstance(variables, str) else variables
+        except json.JSONDecodeError:
+            variables = {}
+        return json.dumps({"query": graphql.get("query", ""), "variables": variables}), "application/json"
+    return None, None
+
+def _iter_postman_items(items, inherited_auth):
+    for item in items:
+        auth = item.get("auth", inherited_auth)
+        if "item" in item:
+            yield from _iter_postman_items(item["item"], auth)
+            continue
+        request = item.get("request")
+        if isinstance(request, str):
+            request = {"method": "GET", "url": request}
+        if not request:
+            continue
+        auth = request.get("auth", auth)
+        headers = {h.get("key", ""): h.get("value", "") for h in request.get("header", []) if not h.get("disabled")}
+        authenticated = bool(auth and auth.get("type") not in (None, "noauth")) or any(name.lower() in AUTH_HEADERS for name in headers)
+        path, query = _postman_path(request.get("url", "/"))
+        body, content_type = _postman_body(request.get("body"))
+        yield make_operation(request.get("method", "GET"), path, query, headers, body, content_type,
+                             authenticated, item.get("name"))
+
+def iter_postman_operations(file_path):
+    """Yield operations from a Postman v2.0/v2.1 collection."""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        collection = json.load(f)
+    yield from _iter_postman_items(collection.get("item", []), collection.get("auth"))
+
+# --- GraphQL introspection -------------------------------------------------------
+
+_GRAPHQL_SCALARS = {"String": "example", "ID": "1", "Int": 0, "Float": 0.0, "Boolean": True}
+
+def _type_name(type_ref):
+    """Render a GraphQL type reference, e.g. [String!]!"""
+    kind = type_ref.get("kind")
+    if kind == "NON_NULL":
+        return _type_name(type_ref["ofType"]) + "!"
+    if kind == "LIST":
+        return "[" + _type_name(type_ref["ofType"]) + "]"
+    return type_ref.get("name")
+
+def _named_type(type_ref):
+    while type_ref.get("ofType"):
+        type_ref = type_ref["ofType"]
+    return type_ref
+
+def _example_value(type_ref, types, depth=0):
+    kind = type_ref.get("kind")
+    if kind == "NON_NULL":
+        return _example_value(type_ref["ofType"], types, depth)
+    if kind == "LIST":
+        return [_example_value(type_ref["ofType"], types, depth)]
+    name = type_ref.get("name")
+    definition = types.get(name, {})
+    if definition.get("kind") == "ENUM" and definition.get("enumValues"):
+        return definition["enumValues"][0]["name"]
+    if definition.get("kind") == "INPUT_OBJECT" and depth < 3:
+        return {field["name"]: _example_value(field["type"], types, depth + 1)
+                for field in definition.get("inputFields") or []
+                if field["type"].get("kind") == "NON_NULL"}
+    return _GRAPHQL_SCALARS.get(name, "example")
+
+def _selection(type_ref, types):
+    definition = types.get(_named_type(type_ref).get("name"), {})
+    if definition.get("kind") not in ("OBJECT", "INTERFACE", "UNION"):
+        return ""
+    scalars = [field["name"] for field in definition.get("fields") or []
+               if types.get(_named_type(field["type"]).get("name"), {}).get("kind") in ("SCALAR", "ENUM")
+               and not any(arg["type"].get("kind") == "NON_NULL" for arg in field.get("args", []))]
+    return " { " + " ".join(scalars or ["__typename"]) + " }"
+
+def iter_graphql_operations(file_path, endpoint="/graphql"):
+    """Yield one POST operation per root query/mutation field of an introspection dump."""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    schema = data.get("data", data).get("__schema", {})
+    types = {t["name"]: t for t in schema.get("types", []) if t.get("name")}
+    for keyword, root in (("query", schema.get("queryType")), ("mutation", schema.get("mutationType"))):
+        if not root or root.get("name") not in types:
+            continue
+        for field in types[root["name"]].get("fields") or []:
+            args = field.get("args", [])
+            variables = {arg["name"]: _example_value(arg["type"], types) for arg in args}
+            declarations = ", ".join(f"${arg['name']}: {_type_name(arg['type'])}" for arg in args)
+            arguments = ", ".join(f"{arg['name']}: ${arg['name']}" for arg in args)
+            query = (f"{keyword} {field['name']}" + (f"({declarations})" if args else "")
+                     + " { " + field["name"] + (f"({arguments})" if args else "")
+                     + _selection(field["type"], types) + " }")
+            body = json.dumps({"query": query, "variables": variables})
+            # An introspection dump says nothing about which fields need credentials
+            yield make_operation("POST", endpoint, body=body, content_type="application/json",
+                                 authenticated=None, operation_id=f"{keyword}_{field['name']}")
+
+# --- Pipeline ------------------------------------------------------------------
+
+def operations_to_spec(operations, title="Ingested API"):
+    """Build a minimal OpenAPI 3 document from operations.
+
+    An operation seen without credentials gets "security": [], so
+    detect_public_endpoints() and the other spec-based tools treat it as
+    public. Operations of unknown authentication (GraphQL) keep the global
+    requirement. Operations sharing a method and path (e.g. GraphQL fields) collapse
+    into one entry.
+    """
+    paths = {}
+    for op in operations:
+        entry = paths.setdefault(op["path"], {}).setdefault(op["method"].lower(), {"responses": {"default": {"description": ""}}})
+        if op["operation_id"] and "operationId" not in entry:
+            entry["operationId"] = op["operation_id"]
+        if op.get("authenticated") is False:
+            entry["security"] = []
+        if op["body"] and "requestBody" not in entry:
+            entry["requestBody"] = {"content": {op["content_type"].split(";")[0]: {"schema": {}}}}
+    return {
+        "openapi": "3.0.3",
+        "info": {"title": title, "version": "1.0"},
+        "paths": paths,
+        "components": {"securitySchemes": {"captured": {"type": "apiKey", "in": "header", "name": "Authorization"}}},
+        "security": [{"captured": []}],
+    }
+
+def write_burp_requests(operations, host, output_dir, auth_headers=None):
+    """Write each operation with create_burp_request / save_burp_request."""
+    from openapi_parse_v1 import create_burp_request, create_request_template
+    from swagger_v1 import save_burp_request
+
+    if os.path.exists(output_dir):
+        shutil.rmtree(output_dir)
+    os.makedirs(output_dir)
+
+    template = create_request_template(host, auth_headers or {})
+    for index, op in enumerate(operations):
+        path = op["path"] + ("?" + op["query"] if op["query"] else "")
+        request = create_burp_request(op["method"], path, host, {}, op["body"], op["content_type"], template, op["headers"])
+        name = op["operation_id"] or f"{op['method']}_{op['path']}"
+        save_burp_request(request, f"{index:04d}_{name}".replace('{', '').replace('}', ''), output_dir)
+
+def unique_operations(operations):
+    """Drop repeated captures of one operation, remembering unauthenticated sightings."""
+    seen = {}
+    for op in operations:
+        key = (op["method"], op["path"], op["query"], op["operation_id"])
+        if key in seen:
+            # One unauthenticated sighting wins; an unknown one beats authenticated ones
+            if seen[key]["authenticated"] is not False and op["authenticated"] is not True:
+                seen[key]["authenticated"] = op["authenticated"]
+        else:
+            seen[key] = op
+    return list(seen.values())
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ingest HAR captures, Postman collections or GraphQL introspection dumps")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--har", help="HAR capture (parsed incrementally)")
+    source.add_argument("--postman", help="Postman v2.x collection JSON")
+    source.add_argument("--graphql", help="GraphQL introspection result JSON")
+    parser.add_argument("--graphql-path", default="/graphql", help="GraphQL endpoint path (default: /graphql)")
+    parser.add_argument("--host", help="Host header for Burp requests; HAR captures default to the captured host")
+    parser.add_argument("--output-dir", default="burp_requests", help="Directory to save Burp request files")
+    parser.add_argument("--spec-out", help="Write the ingested operations as an OpenAPI 3 JSON document")
+    args = parser.parse_args(argv)
+
+    host = args.host
+    try:
+        if args.har:
+            operations = []
+            for op, captured_host in iter_har_operations(args.har):
+                host = host or captured_host
+                operations.append(op)
+        elif args.postman:
+            operations = list(iter_postman_operations(args.postman))
+        else:
+            operations = list(iter_graphql_operations(args.graphql, args.graphql_path))
+    except (OSError, json.JSONDecodeError, KeyError, AttributeError) as e:
+        print(f"Error reading input: {e}")
+        sys.exit(1)
+
+    operations = unique_operations(operations)
+    print(f"Ingested {len(operations)} operation(s)")
+
+    from api_endpoints_without_auth import detect_public_endpoints
+
+    spec = operations_to_spec(operations)
+    public = detect_public_endpoints(spec)
+    print("Endpoints seen without credentials:")
+    for method, path in public:
+        print(f"  {method} {path}")
+    if not public:
+        print("  None.")
+
+    if args.spec_out:
+        with open(args.spec_out, 'w', encoding='utf-8') as f:
+            json.dump(spec, f, indent=2)
+    if host:
+        write_burp_requests(operations, host, args.output_dir)
+        print(f"Burp requests saved to {args.output_dir}/")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+# python3 load_test.py --spec swagger.json --base-url http://127.0.0.1:8080 --rps 200 --duration 30 --warmup 5
+# python3 load_test.py --requests-dir burp_requests --base-url https://staging.example.com --concurrency 16
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+# Headers the HTTP client manages itself when replaying raw request files
+CLIENT_MANAGED_HEADERS = {"host", "content-length", "connection"}
+
+def parse_raw_request(data):
+    """Parse a raw HTTP request (as written to burp_requests/) into an operation."""
+    text = data.decode('utf-8', errors='replace')
+    newline = "\r\n" if "\r\n" in text else "\n"
+    head, _, body = text.partition(newline * 2)
+    lines = head.split(newline)
+    method, target = lines[0].split(" ")[:2]
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        if name and name.strip().lower() not in CLIENT_MANAGED_HEADERS:
+            headers[name.strip()] = value.strip()
+    return {
+        "method": method.upper(),
+        "path": target.split("?", 1)[0],
+        "request_path": target,
+        "headers": headers,
+        "body": body or None,
+    }
+
+def load_request_files(directory):
+    """Load every .txt request in directory, in file name order."""
+    operations = []
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(".txt"):
+            with open(os.path.join(directory, name), 'rb') as f:
+                operations.append(parse_raw_request(f.read()))
+    return operations
+
+def load_spec_operations(file_path, auth_value=None, auth_type="bearer"):
+    """Build the request set from a Swagger 2.0 / OpenAPI 3 spec, as the generators do."""
+    from multi_identity import collect_operations
+    from openapi_parse_v1 import STATIC_HEADERS, get_auth_headers
+
+    with open(file_path, 'r', encoding='utf-8') as f:
+        spec = json.load(f)
+    # Keep-alive instead of the generators' "Connection: close"
+    static = {k: v for k, v in STATIC_HEADERS.items() if k.lower() not in CLIENT_MANAGED_HEADERS}
+    auth = get_auth_headers(spec, auth_value, auth_type)
+    operations = collect_operations(spec)
+    for op in operations:
+        # Credentials go last: no spec header parameter may replace them
+        op["headers"] = {**static, **op["headers"], **auth}
+    return operations
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * q // 100))
+    return sorted_values[int(rank) - 1]
+
+class LoadTest:
+    """Replay a request set at a target rate (open loop) or concurrency (closed loop).
+
+    With rps, request i is scheduled at start + i / rps whatever the
+    responses do. Latency is measured from the scheduled time, so time a
+    request spends waiting for a free worker counts against the target
+    instead of being hidden (no coordinated omission). With concurrency,
+    that many workers send back to back. Operations are used round robin.
+    Requests scheduled during the first `warmup` seconds are sent but not
+    measured.
+    """
+
+    def __init__(self, operations, base_url, rps=None, concurrency=None, duration=30, warmup=5,
+                 timeout=10, max_in_flight=256, proxy=None, clock=time.perf_counter):
+        self.operations = operations
+        self.base_url = base_url.rstrip('/')
+        self.rps = rps
+        self.concurrency = concurrency
+        self.duration = duration
+        self.warmup = warmup
+        self.timeout = timeout
+        self.max_in_flight = max_in_flight
+        self.proxies = {"http": proxy, "https": proxy} if proxy else None
+        self.clock = clock
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._completed_in_window = 0
+        self._lags = []
+        self._window_start = self._window_end = 0.0
+
+    def _session(self):
+        if not hasattr(self._local, "session"):
+            from requests.adapters import HTTPAdapter
+
+            from api_endpoints_without_auth import create_session
+
+            session = create_session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=1)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._local.session = session
+        return self._local.session
+
+    def _send(self, op, scheduled, measured):
+        started = self.clock()
+        try:
+            response = self._session().request(op["method"], self.base_url + op["request_path"], headers=op["headers"],
+                                               data=op["body"], timeout=self.timeout, verify=False,
+                                               allow_redirects=False, proxies=self.proxies)
+            status = response.status_code
+        except Exception as e:
+            status = type(e).__name__
+        finished = self.clock()
+        if not measured:
+            return
+        with self._lock:
+            stats = self._stats.setdefault(f"{op['method']} {op['path']}", {"latencies": [], "statuses": Counter()})
+            stats["latencies"].append((finished - scheduled) * 1000)
+            stats["statuses"][status] += 1
+            self._lags.append((started - scheduled) * 1000)
+            if finished <= self._window_end:
+                self._completed_in_window += 1
+
+    def run(self):
+        """Run the test and return the report (see summarize())."""
+        start = self.clock()
+        self._window_start = start + self.warmup
+        self._window_end = self._window_start + self.duration
+        operations = self.operations
+
+        if self.rps:
+            with ThreadPoolExecutor(max_workers=self.max_in_flight) as pool:
+                i = 0
+                while True:
+                    scheduled = start + i / self.rps
+                    if scheduled >= self._window_end:
+                        break
+                    delay = scheduled - self.clock()
+                    if delay > 0:
+                        time.sleep(delay)
+                    pool.submit(self._send, operations[i % len(operations)], scheduled, scheduled >= self._window_start)
+                    i += 1
+        else:
+            def worker(offset):
+                j = offset
+                while True:
+                    scheduled = self.clock()
+                    if scheduled >= self._window_end:
+                        break
+                    self._send(operations[j % len(operations)], scheduled, scheduled >= self._window_start)
+                    j += self.concurrency
+
+            with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+                for offset in range(self.concurrency):
+                    pool.submit(worker, offset)
+        return self.summarize()
+
+    def summarize(self):
+        """Per-operation and total counts, error rates and latency percentiles (ms)."""
+        operations = {}
+        all_latencies = []
+        errors = total = 0
+        for key in sorted(self._stats):
+            stats = self._stats[key]
+            latencies = sorted(stats["latencies"])
+            all_latencies.extend(latencies)
+            # Transport failures and 5xx count as errors; 4xx are valid answers under test
+            op_errors = sum(n for status, n in stats["statuses"].items() if not isinstance(status, int) or status >= 500)
+            errors += op_errors
+            total += len(latencies)
+            operations[key] = {
+                "count": len(latencies),
+                "error_rate": op_errors / len(latencies),
+                "statuses": {str(status): n for status, n in sorted(stats["statuses"].items(), key=str)},
+                "p50": percentile(latencies, 50),
+                "p95": percentile(latencies, 95),
+                "p99": percentile(latencies, 99),
+            }
+        all_latencies.sort()
+        lags = sorted(self._lags)
+        return {
+            "mode": f"{self.rps} rps (open loop)" if self.rps else f"{self.concurrency} concurrent (closed loop)",
+            "duration": self.duration,
+            "requests": total,
+            "throughput": self._completed_in_window / self.duration,
+            "error_rate": errors / total if total else 0.0,
+            "p50": percentile(all_latencies, 50),
+            "p95": percentile(all_latencies, 95),
+            "p99": percentile(all_latencies, 99),
+            "start_lag_p99": percentile(lags, 99),
+            "operations": operations,
+        }
+
+def format_report(report):
+    def ms(value):
+        return f"{value:.1f}" if value is not None else "-"
+
+    width = max([len("OPERATION")] + [len(key) for key in report["operations"]])
+    lines = [
+        f"Mode: {report['mode']}, {report['duration']}s measured",
+        f"Requests: {report['requests']}, throughput: {report['throughput']:.1f} req/s, "
+        f"errors: {report['error_rate']:.2%}, start lag p99: {ms(report['start_lag_p99'])} ms",
+        "",
+        f"  {'OPERATION'.ljust(width)}  {'COUNT':>7}  {'ERR%':>6}  {'P50':>8}  {'P95':>8}  {'P99':>8}  STATUSES",
+    ]
+    for key, op in report["operations"].items():
+        statuses = " ".join(f"{status}:{n}" for status, n in op["statuses"].items())
+        lines.append(f"  {key.ljust(width)}  {op['count']:>7}  {op['error_rate'] * 100:>5.1f}%  "
+                     f"{ms(op['p50']):>8}  {ms(op['p95']):>8}  {ms(op['p99']):>8}  {statuses}")
+    lines.append(f"  {'ALL'.ljust(width)}  {report['requests']:>7}  {report['error_rate'] * 100:>5.1f}%  "
+                 f"{ms(report['p50']):>8}  {ms(report['p95']):>8}  {ms(report['p99']):>8}")
+    lines.append("  (latency in ms, from scheduled send time)")
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay the generated request set under load and report latency and throughput")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--spec", help="Swagger 2.0 / OpenAPI 3 JSON file to build the request set from")
+    source.add_argument("--requests-dir", help="Directory of generated raw requests (e.g. burp_requests)")
+    parser.add_argument("--base-url", required=True, help="Target origin, e.g. http://127.0.0.1:8080")
+    load = parser.add_mutually_exclusive_group(required=True)
+    load.add_argument("--rps", type=float, help="Target requests per second (open loop)")
+    load.add_argument("--concurrency", type=int, help="Number of back-to-back senders (closed loop)")
+    parser.add_argument("--duration", type=float, default=30, help="Measured seconds (default: 30)")
+    parser.add_argument("--warmup", type=float, default=5, help="Unmeasured seconds before the measurement (default: 5)")
+    parser.add_argument("--timeout", type=float, default=10, help="Timeout in seconds for each request (default: 10)")
+    parser.add_argument("--max-in-flight", type=int, default=256, help="Open-loop cap on concurrent requests (default: 256)")
+    parser.add_argument("--auth-value", help="Authentication value for --spec (Bearer token, API key, or user:pass)")
+    parser.add_argument("--auth-type", choices=["bearer", "apiKey", "basic"], default="bearer", help="Authentication type")
+    parser.add_argument("--proxy", help="Proxy URL (e.g., http://127.0.0.1:8080)")
+    parser.add_argument("--json", help="Also write the report as JSON to this file")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.spec:
+            operations = load_spec_operations(args.spec, args.auth_value, args.auth_type)
+        else:
+            operations = load_request_files(args.requests_dir)
+    except (OSError, ValueError) as e:
+        print(f"Error loading requests: {e}")
+        sys.exit(1)
+    if not operations:
+        print("No requests to replay")
+        sys.exit(1)
+
+    print(f"Replaying {len(operations)} request(s) against {args.base_url}")
+    test = LoadTest(operations, args.base_url, args.rps, args.concurrency, args.duration, args.warmup,
+                    args.timeout, args.max_in_flight, args.proxy)
+    report = test.run()
+    print(format_report(report))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+# python3 multi_identity.py --file openapi.json --host api.example.com --identities identities.json
+# python3 multi_identity.py --file swagger.json --host api.example.com --identities identities.json --replay --matrix-out matrix.csv
+
+import argparse
+import csv
+import json
+import os
+import shlex
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from openapi_parse_v1 import STATIC_HEADERS, get_auth_headers
+from request_templates import RequestTemplate
+from spec_validation import spec_version
+
+class Identity:
+    """One set of credentials, optionally refreshed through a local command.
+
+    The refresh command is run without a shell; its stripped stdout becomes
+    the new auth value. It runs when the value is older than refresh_every
+    seconds, and on a 401 once the value is at least min_token_age seconds
+    old. Denied requests are the normal case in an access-control test, so
+    a 401 on a fresh token is taken at face value.
+    """
+
+    def __init__(self, name, auth_type=None, auth_value=None, refresh_command=None, refresh_every=None,
+                 min_token_age=60):
+        self.name = name
+        self.auth_type = auth_type or "bearer"
+        self.auth_value = auth_value
+        self.refresh_command = refresh_command
+        self.refresh_every = refresh_every
+        self.min_token_age = min_token_age
+        self.generation = 0
+        self.refreshed_at = time.monotonic()
+        self.attempted_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def anonymous(self):
+        return not self.auth_value and not self.refresh_command
+
+    def headers(self):
+        """Current auth headers, refreshing first if the value has expired."""
+        if self.refresh_command and self.refresh_every and time.monotonic() - self.refreshed_at >= self.refresh_every:
+            self.refresh(self.generation)
+        return get_auth_headers(None, self.auth_value, self.auth_type)
+
+    def refresh(self, seen_generation):
+        """Run the refresh hook unless another thread already did since seen_generation."""
+        if not self.refresh_command:
+            return False
+        with self._lock:
+            if self.generation != seen_generation:
+                return True
+            self.attempted_at = time.monotonic()
+            try:
+                result = subprocess.run(shlex.split(self.refresh_command), capture_output=True, text=True, timeout=60)
+            except (OSError, ValueError, subprocess.TimeoutExpired) as e:
+                # A missing, unrunnable or hanging hook fails this identity's refresh, not the run
+                print(f"Token refresh failed for {self.name}: {e}")
+                return False
+            if result.returncode != 0 or not result.stdout.strip():
+                print(f"Token refresh failed for {self.name}: {result.stderr.strip()}")
+                return False
+            self.auth_value = result.stdout.strip()
+            self.generation += 1
+            self.refreshed_at = time.monotonic()
+            return True
+
+    def refresh_after_401(self, seen_generation):
+        """Refresh after a 401 unless the last refresh (or attempt) is younger than min_token_age.
+
+        Returns True if the request should be retried with a newer value.
+        """
+        if self.generation != seen_generation:
+            return True
+        last = max(self.refreshed_at, self.attempted_at or 0)
+        if time.monotonic() - last < self.min_token_age:
+            return False
+        return self.refresh(seen_generation)
+
+def load_identities(file_path):
+    """Load identities from a JSON list of {name, auth_type, auth_value, refresh_command, refresh_every, min_token_age}."""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        entries = json.load(f)
+    identities = []
+    for entry in entries:
+        identity = Identity(**entry)
+        # Identities with only a refresh hook get their first token up front
+        if identity.refresh_command and not identity.auth_value:
+            identity.refresh(identity.generation)
+        identities.append(identity)
+    names = [identity.name for identity in identities]
+    if len(set(names)) != len(names):
+        raise ValueError("Identity names must be unique")
+    return identities
+
+def auth_header_names(spec):
+    """Lower-cased names of the headers that carry credentials for spec.
+
+    Authorization and X-API-Key (what get_auth_headers sends), plus the
+    name of every apiKey security scheme passed in a header.
+    """
+    names = {"authorization", "x-api-key"}
+    schemes = spec.get('securityDefinitions') or (spec.get('components') or {}).get('securitySchemes') or {}
+    for scheme in schemes.values():
+        if isinstance(scheme, dict) and scheme.get('type') == 'apiKey' and scheme.get('in') == 'header' and scheme.get('name'):
+            names.add(scheme['name'].lower())
+    return names
+
+def collect_operations(spec):
+    """Build the auth-independent operation set once from a Swagger 2.0 or OpenAPI 3 spec.
+
+    Header parameters that carry credentials are left out, so a spec's
+    Authorization parameter never overrides (or adds) an identity's auth.
+    """
+    if spec_version(spec) == "2.0":
+        import swagger_v1
+
+        auth_headers = auth_header_names(spec)
+        base_path = spec.get('basePath', '/')
+        definitions = spec.get('definitions', {})
+        operations = []
+        for path, methods in spec.get('paths', {}).items():
+            for method, details in methods.items():
+                if method.lower() not in {"get", "post", "put", "delete", "patch", "options", "head"}:
+                    continue
+                parameters = details.get('parameters', [])
+                body_schema = None
+                for param in parameters:
+                    if param.get('in') == 'body':
+                        body_schema = param.get('schema', {})
+                request_path, headers, body = swagger_v1.build_operation(method, path, base_path, parameters, body_schema, definitions)
+                headers = {name: value for name, value in headers.items() if name.lower() not in auth_headers}
+                if body:
+                    headers["Content-Type"] = "application/json"
+                operations.append({
+                    "operation_id": details.get('operationId'),
+                    "method": method.upper(),
+                    "path": path,
+                    "request_path": request_path,
+                    "headers": headers,
+                    "body": body,
+                })
+        return operations
+
+    import openapi_parse_v1
+
+    operations = openapi_parse_v1.build_operations(spec)
+    template = RequestTemplate({})
+    for op in operations:
+        op["request_path"] = template.operation(op["method"], op["path"]).render_path(op["path_values"], op["query"]).decode('utf-8')
+    return operations
+
+def operation_key(op):
+    return f"{op['method']} {op['path']}"
+
+def identity_template(identity, host):
+    return RequestTemplate({"Host": host, **identity.headers(), **STATIC_HEADERS})
+
+def write_identity_requests(operations, identities, host, output_dir):
+    """Render the shared operation set once per identity into output_dir/<identity>/."""
+    if os.path.exists(output_dir):
+        shutil.rmtree(output_dir)
+    for identity in identities:
+        identity_dir = os.path.join(output_dir, identity.name)
+        os.makedirs(identity_dir)
+        template = identity_template(identity, host)
+        for index, op in enumerate(operations):
+            request = template.operation(op["method"], op["request_path"], op["headers"]).render(body=op["body"])
+            name = op["operation_id"] or f"{op['method']}_{op['path']}"
+            safe_name = name.replace('/', '_').replace(' ', '_').replace('{', '').replace('}', '')
+            with open(os.path.join(identity_dir, f"{index:04d}_{safe_name}.txt"), "wb") as f:
+                f.write(request)
+
+def replay(operations, identities, base_url, proxy=None, workers=16, timeout=10):
+    """Send every operation as every identity concurrently.
+
+    Returns {operation key: {identity name: status code or "ERR"}}.
+    """
+    from api_endpoints_without_auth import create_session
+
+    local = threading.local()
+    proxies = {"http": proxy, "https": proxy} if proxy else None
+
+    def send(identity, op):
+        if not hasattr(local, "session"):
+            local.session = create_session()
+        url = base_url.rstrip('/') + op["request_path"]
+        retried = False
+        while True:
+            generation = identity.generation
+            headers = {**STATIC_HEADERS, **op["headers"], **identity.headers()}
+            try:
+                response = local.session.request(op["method"], url, headers=headers, data=op["body"],
+                                                 proxies=proxies, timeout=timeout, verify=False, allow_redirects=False)
+            except Exception as e:
+                print(f"Error sending {op['method']} {url} as {identity.name}: {e}")
+                return "ERR"
+            # An expired token shows up as 401: refresh (if the token isn't fresh) and retry once
+            if response.status_code == 401 and not retried and identity.refresh_after_401(generation):
+                retried = True
+                continue
+            return response.status_code
+
+    matrix = {operation_key(op): {} for op in operations}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {(operation_key(op), identity.name): pool.submit(send, identity, op)
+                   for op in operations for identity in identities}
+        for (key, name), future in futures.items():
+            matrix[key][name] = future.result()
+    return matrix
+
+def suspicious(row, identities):
+    """True if any anonymous identity got a 2xx for this operation."""
+    anonymous = [i.name for i in identities if i.anonymous]
+    return any(isinstance(row.get(name), int) and 200 <= row[name] < 300 for name in anonymous)
+
+def format_matrix(matrix, identities):
+    """Render the status-code matrix as an aligned text table; '!' marks anonymous 2xx."""
+    names = [identity.name for identity in identities]
+    key_width = max([len("OPERATION")] + [len(key) for key in matrix])
+    widths = [max(len(name), 3) for name in names]
+    lines = ["  " + "OPERATION".ljust(key_width) + "  " + "  ".join(n.ljust(w) for n, w in zip(names, widths))]
+    for key, row in matrix.items():
+        cells = "  ".join(str(row.get(n, "")).ljust(w) for n, w in zip(names, widths))
+        flag = "!" if suspicious(row, identities) else " "
+        lines.append(f"{flag} {key.ljust(key_width)}  {cells}")
+    return "\n".join(lines)
+
+def write_matrix(matrix, identities, file_path):
+    """Write the matrix as CSV, or JSON when file_path ends in .json."""
+    names = [identity.name for identity in identities]
+    if file_path.endswith('.json'):
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(matrix, f, indent=2)
+        return
+    with open(file_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(["operation"] + names + ["anonymous_2xx"])
+        for key, row in matrix.items():
+            writer.writerow([key] + [row.get(n, "") for n in names] + [suspicious(row, identities)])
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate and replay requests under several identities")
+    parser.add_argument("--file", required=True, help="Path to Swagger 2.0 / OpenAPI 3 JSON file")
+    parser.add_argument("--host", required=True, help="Host header (e.g., api.example.com)")
+    parser.add_argument("--identities", required=True, help="JSON file with a list of identities")
+    parser.add_argument("--output-dir", default="burp_requests", help="Directory for per-identity request files")
+    parser.add_argument("--replay", action="store_true", help="Send every request as every identity and print a status matrix")
+    parser.add_argument("--scheme", default="https", choices=["http", "https"], help="Scheme used when replaying (default: https)")
+    parser.add_argument("--proxy", help="Proxy URL for replayed requests (e.g., http://127.0.0.1:8080)")
+    parser.add_argument("--workers", type=int, default=16, help="Concurrent requests when replaying (default: 16)")
+    parser.add_argument("--matrix-out", help="Write the status matrix to a CSV (or .json) file")
+    args = parser.parse_args(argv)
+
+    with open(args.file, 'r', encoding='utf-8') as f:
+        spec = json.load(f)
+    try:
+        identities = load_identities(args.identities)
+    except (OSError, ValueError, TypeError) as e:
+        print(f"Error loading identities: {e}")
+        sys.exit(1)
+
+    operations = collect_operations(spec)
+    write_identity_requests(operations, identities, args.host, args.output_dir)
+    print(f"Generated {len(operations)} request(s) for {len(identities)} identities in {args.output_dir}/")
+
+    if args.replay:
+        matrix = replay(operations, identities, f"{args.scheme}://{args.host}", args.proxy, args.workers)
+        print(format_matrix(matrix, identities))
+        if args.matrix_out:
+            write_matrix(matrix, identities, args.matrix_out)
+
+if __name__ == "__main__":
+    main()
@@ -2,30 +2,34 @@ import json
 import os
 import argparse
 from urllib.parse import urlencode
+from request_templates import RequestTemplate
 
 def parse_openapi(file_path):
     with open(file_path, 'r') as f:
         openapi_data = json.load(f)
     return openapi_data
 
-def create_burp_request(method, path, host, params, headers, body=None):
-    request = f"{method.upper()} {path} HTTP/1.1\r\n"
-    request += f"Host: {host}\r\n"
-    for header, value in headers.items():
-        request += f"{header}: {value}\r\n"
-    request += "User-Agent: Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36\r\n"
-    request += "Accept: application/json\r\n"
-    request += "Connection: close\r\n"
+# Headers sent with every request, after Host and the auth header
+STATIC_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+    "Accept": "application/json",
+    "Connection": "close",
+}
+
+def create_request_template(host, headers):
+    return RequestTemplate({"Host": host, **headers, **STATIC_HEADERS})
+
+def create_burp_request(method, path, host, params, headers, body=None, template=None, content_type="application/json"):
+    if template is None:
+        template = create_request_template(host, headers)
     
+    op_headers = {}
     if method.upper() in ["POST", "PUT"] and body:
-        request += f"Content-Type: application/json\r\n"
-        request += f"Content-Length: {len(body)}\r\n"
-        request += "\r\n"
-        request += body
+        op_headers["Content-Type"] = content_type
     else:
-        request += "\r\n"
+        body = None
     
-    return request
+    return template.operation(method, path, op_headers).render(body=body)
 
 def generate_burp_requests(openapi_data, host, auth_token, proxy):
     # Create output directory
@@ -36,6 +40,7 @@ def generate_burp_requests(openapi_data, host, auth_token, proxy):
     headers = {}
     if auth_token:
         headers["Authorization"] = f"Bearer {auth_token}"
+    template = create_request_template(host, headers)
     
     paths = openapi_data.get("paths", {})
     for path, methods in paths.items():
@@ -59,6 +64,7 @@ def generate_burp_requests(openapi_data, host, auth_token, proxy):
             
             # Handle request body
             body = None
+            content_type = "application/json"
             if "requestBody" in details:
                 content = details["requestBody"].get("content", {})
                 if "application/json" in content:
@@ -71,16 +77,18 @@ def generate_burp_requests(openapi_data, host, auth_token, proxy):
                         body = json.dumps({"example": "data"})
                 elif "multipart/form-data" in content:
                     body = "--boundary\nContent-Disposition: form-data; name=\"example\"\n\nexample\n--boundary--"
-                    headers["Content-Type"] = "multipart/form-data; boundary=boundary"
+                    content_type = "multipart/form-data; boundary=boundary"
+                    headers["Content-Type"] = content_type
                 elif "application/x-www-form-urlencoded" in content:
                     body = urlencode({"example": "data"})
-                    headers["Content-Type"] = "application/x-www-form-urlencoded"
+                    content_type = "application/x-www-form-urlencoded"
+                    headers["Content-Type"] = content_type
             
             # Create Burp request
-            request = create_burp_request(method, full_path, host, query_params, headers, body)
+            request = create_burp_request(method, full_path, host, query_params, headers, body, template, content_type)
             
             # Save to file
-            with open(filename, "w") as f:
+            with open(filename, "wb") as f:
                 f.write(request)
             
             # If proxy is specified, send request to Burp Suite
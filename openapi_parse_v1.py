@@ -2,41 +2,21 @@ import json
 import os
 import argparse
 import base64
-import requests
 import shutil
+import sys
 from urllib.parse import urlencode
-from jsonschema import validate, ValidationError
-from uuid import uuid4
-
-# OpenAPI v3 schema for validation (simplified)
-OPENAPI_SCHEMA = {
-    "type": "object",
-    "required": ["openapi", "info", "paths"],
-    "properties": {
-        "openapi": {"type": "string"},
-        "info": {"type": "object"},
-        "paths": {"type": "object"},
-        "components": {"type": "object"}
-    }
-}
+from request_templates import RequestTemplate
+from compact_spec import load_spec
+from spec_validation import MetaSchemaError, SpecValidationError, format_errors, validate_spec
 
-def validate_openapi(data):
-    """Validate OpenAPI document against a simplified schema."""
-    try:
-        validate(instance=data, schema=OPENAPI_SCHEMA)
-        return True
-    except ValidationError as e:
-        print(f"OpenAPI validation error: {e}")
-        return False
-
-def parse_openapi(file_path):
-    """Parse and validate OpenAPI JSON file."""
+def parse_openapi(file_path, validate="fast", compact=False, compact_cache=False):
+    """Parse OpenAPI JSON file and validate it (validate: off, fast or full).
+
+    compact loads a read-only, memory-compact form (see compact_spec.py);
+    compact_cache also reuses a memory-mapped binary form across runs.
+    """
     try:
-        with open(file_path, 'r') as f:
-            openapi_data = json.load(f)
-        if not validate_openapi(openapi_data):
-            raise ValueError("Invalid OpenAPI document")
-        return openapi_data
+        openapi_data = load_spec(file_path, compact, compact_cache)
     except json.JSONDecodeError as e:
         print(f"Error parsing JSON: {e}")
         raise
@@ -44,6 +24,11 @@ def parse_openapi(file_path):
         print(f"Error reading OpenAPI file: {e}")
         raise
 
+    errors = validate_spec(openapi_data, validate)
+    if errors:
+        raise SpecValidationError(errors)
+    return openapi_data
+
 def generate_example_value(schema, components):
     """Generate example value for a schema, handling enums, arrays, and references."""
     if not schema:
@@ -97,121 +82,186 @@ def get_auth_headers(openapi_data, auth_value, auth_type):
             headers["Authorization"] = f"Basic {encoded}"
     return headers
 
-def create_burp_request(method, path, host, headers, body=None, content_type="application/json"):
-    """Generate HTTP request string in Burp Suite format."""
-    # Build request line and headers
-    request_lines = [f"{method.upper()} {path} HTTP/1.1", f"Host: {host}"]
-    for header, value in headers.items():
-        request_lines.append(f"{header}: {value}")
-    request_lines.append("User-Agent: Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
-    request_lines.append("Accept: application/json")
-    request_lines.append("Connection: close")
-    
-    # Add Content-Type and Content-Length for methods with body
-    if method.upper() in ["POST", "PUT", "PATCH"] and body:
-        request_lines.append(f"Content-Type: {content_type}")
-        request_lines.append(f"Content-Length: {len(body)}")
+# Headers sent with every request, after Host and the auth headers
+STATIC_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+    "Accept": "application/json",
+    "Connection": "close",
+}
+
+def create_request_template(host, headers):
+    """Compile the per-run request template (Host, auth and static headers)."""
+    return RequestTemplate({"Host": host, **headers, **STATIC_HEADERS})
+
+def create_burp_request(method, path, host, headers, body=None, content_type="application/json", template=None,
+                        operation_headers=None):
+    """Generate HTTP request bytes in Burp Suite format.
+
+    operation_headers (e.g. a captured X-Tenant) follow the run's headers.
+    A body is kept for any method that has one, DELETE included.
+    """
+    if template is None:
+        template = create_request_template(host, headers)
     
-    # Add single empty line and body (if present)
-    request_lines.append("")
+    # Add Content-Type (and Content-Length, on render) when there is a body
+    op_headers = dict(operation_headers or {})
     if body:
-        request_lines.append(body)
+        op_headers["Content-Type"] = content_type
+    else:
+        body = None
+    
+    return template.operation(method, path, op_headers).render(body=body)
+
+HTTP_METHODS = {"get", "post", "put", "delete", "patch", "options", "head"}
+
+def build_operation(path, method, details, components):
+    """Build the auth-independent parts of one operation's request."""
+    # Handle all parameter types
+    query_params = {}
+    path_values = {}
+    for param in details.get("parameters", []):
+        schema = param.get("schema", {})
+        param_name = param["name"]
+        if param["in"] == "query":
+            query_params[param_name] = generate_example_value(schema, components)
+        elif param["in"] == "path":
+            path_values[param_name] = generate_example_value(schema, components)
+    
+    # Handle request body and content type
+    body = None
+    content_type = "application/json"
+    if "requestBody" in details:
+        content = details["requestBody"].get("content", {})
+        if "application/json" in content:
+            schema = content["application/json"].get("schema", {})
+            body = json.dumps(generate_example_value(schema, components))
+            content_type = "application/json"
+        elif "multipart/form-data" in content:
+            body = "--boundary\nContent-Disposition: form-data; name=\"example\"\n\nexample\n--boundary--"
+            content_type = "multipart/form-data; boundary=boundary"
+        elif "application/x-www-form-urlencoded" in content:
+            body = urlencode({"example": "data"})
+            content_type = "application/x-www-form-urlencoded"
+    
+    # Content-Type (and Content-Length, on render) only for methods with body
+    headers = {}
+    if method.upper() in ["POST", "PUT", "PATCH"] and body:
+        headers["Content-Type"] = content_type
     
-    # Join lines with \r\n
-    return "\r\n".join(request_lines)
+    return {
+        "operation_id": details.get("operationId"),
+        "method": method.upper(),
+        "path": path,
+        "path_values": path_values,
+        "query": urlencode(query_params) if query_params else None,
+        "headers": headers,
+        "body": body,
+        "content_type": content_type,
+    }
+
+def build_operations(openapi_data):
+    """Build every operation in the document, in spec order."""
+    paths = openapi_data.get("paths", {})
+    components = openapi_data.get("components", {})
+    operations = []
+    for path, methods in paths.items():
+        for method, details in methods.items():
+            if method.lower() not in HTTP_METHODS:
+                continue
+            operations.append(build_operation(path, method, details, components))
+    return operations
+
+def render_operation(state, key):
+    """Build and render one (path, method) operation.
+
+    Pure: the result depends only on the spec and the template in state, so
+    operations can be rendered in any process and in any order.
+    """
+    openapi_data, template = state
+    path, method = key
+    op = build_operation(path, method, openapi_data["paths"][path][method], openapi_data.get("components", {}))
+    body = op["body"] if op["headers"] else None
+    operation = template.operation(op["method"], op["path"], op["headers"])
+    request = operation.render(op["path_values"], op["query"], body)
+    full_path = operation.render_path(op["path_values"], op["query"]).decode('utf-8')
+    return op, request, full_path, body
+
+def generate_burp_requests(openapi_data, host, auth_value, auth_type, proxy, output_dir="burp_requests", workers=None):
+    """Generate Burp Suite requests from OpenAPI document.
+
+    File names are the operationId (or method and path) and, when that
+    name is shared, a hash of the operation's method and path. Rendering
+    is spread over worker processes for large specs. Files are written and
+    proxied in spec order, so repeated runs produce byte-identical output.
+    """
+    from operation_pool import render_operations, stable_names
 
-def generate_burp_requests(openapi_data, host, auth_value, auth_type, proxy):
-    """Generate Burp Suite requests from OpenAPI document."""
-    # Remove existing burp_requests directory
-    output_dir = "burp_requests"
+    # Remove existing output directory
     if os.path.exists(output_dir):
         shutil.rmtree(output_dir)
     os.makedirs(output_dir)
     
     headers = get_auth_headers(openapi_data, auth_value, auth_type)
-    paths = openapi_data.get("paths", {})
-    components = openapi_data.get("components", {})
+    template = create_request_template(host, headers)
     
-    for path, methods in paths.items():
-        for method, details in methods.items():
-            operation_id = details.get("operationId", f"{method}_{uuid4().hex[:8]}")
-            filename = f"{output_dir}/{method}_{operation_id}.txt"
-            
-            # Handle all parameter types
-            query_params = {}
-            path_params = []
-            for param in details.get("parameters", []):
-                schema = param.get("schema", {})
-                param_name = param["name"]
-                if param["in"] == "query":
-                    query_params[param_name] = generate_example_value(schema, components)
-                elif param["in"] == "path":
-                    path_params.append(param)
-            
-            # Replace path parameters
-            full_path = replace_path_params(path, path_params, components)
-            if query_params:
-                full_path += "?" + urlencode(query_params)
-            
-            # Handle request body and content type
-            body = None
-            content_type = "application/json"
-            if "requestBody" in details:
-                content = details["requestBody"].get("content", {})
-                if "application/json" in content:
-                    schema = content["application/json"].get("schema", {})
-                    body = json.dumps(generate_example_value(schema, components))
-                    content_type = "application/json"
-                elif "multipart/form-data" in content:
-                    body = "--boundary\nContent-Disposition: form-data; name=\"example\"\n\nexample\n--boundary--"
-                    content_type = "multipart/form-data; boundary=boundary"
-                    headers["Content-Type"] = content_type
-                elif "application/x-www-form-urlencoded" in content:
-                    body = urlencode({"example": "data"})
-                    content_type = "application/x-www-form-urlencoded"
-                    headers["Content-Type"] = content_type
-            
-            # Create Burp request
-            request = create_burp_request(method, full_path, host, headers, body, content_type)
-            
-            # Save to file with explicit \r\n line endings
-            with open(filename, "w", newline='') as f:
-                f.write(request)
-            
-            # Send request to proxy if specified
-            if proxy:
-                proxies = {"http": f"http://{proxy}", "https": f"http://{proxy}"}
-                try:
-                    url = f"http://{host}{full_path}"
-                    method = method.upper()
-                    request_func = {
-                        "GET": requests.get,
-                        "POST": requests.post,
-                        "PUT": requests.put,
-                        "PATCH": requests.patch,
-                        "DELETE": requests.delete,
-                        "OPTIONS": requests.options
-                    }.get(method)
-                    
-                    if request_func:
-                        request_func(url, headers=headers, data=body, proxies=proxies)
-                    else:
-                        print(f"Unsupported HTTP method: {method}")
-                except Exception as e:
-                    print(f"Error sending request to {url}: {e}")
-
-def main():
+    keys = [(path, method) for path, methods in openapi_data.get("paths", {}).items()
+            for method in methods if method.lower() in HTTP_METHODS]
+    names = []
+    for path, method in keys:
+        # <method>_<operationId>, or <method>_<path> when there is no operationId
+        suffix = openapi_data["paths"][path][method].get("operationId") or path.replace('/', '_')
+        names.append(f"{method.lower()}_{suffix}")
+    names = stable_names(names, [f"{method.upper()} {path}" for path, method in keys])
+    
+    session = None
+    rendered = render_operations(render_operation, (openapi_data, template), keys, workers)
+    for name, (op, request, full_path, body) in zip(names, rendered):
+        # Save to file (already encoded with \r\n line endings)
+        with open(os.path.join(output_dir, f"{name}.txt"), "wb") as f:
+            f.write(request)
+        
+        # Send request to proxy if specified
+        if proxy:
+            if session is None:
+                import requests
+
+                session = requests.Session()
+                session.proxies = {"http": f"http://{proxy}", "https": f"http://{proxy}"}
+            url = f"http://{host}{full_path}"
+            try:
+                # Operation headers are merged per request, never into the shared auth headers
+                session.request(op["method"], url, headers={**headers, **op["headers"]}, data=body)
+            except Exception as e:
+                print(f"Error sending request to {url}: {e}")
+
+def main(argv=None):
     parser = argparse.ArgumentParser(description="Generate Burp Suite requests from OpenAPI documentation")
     parser.add_argument("--file", required=True, help="Path to OpenAPI JSON file")
     parser.add_argument("--host", required=True, help="Host header (e.g., example.com)")
     parser.add_argument("--auth-value", help="Authentication value (Bearer token, API key, or user:pass for Basic Auth)")
     parser.add_argument("--auth-type", choices=["bearer", "apiKey", "basic"], default="bearer", help="Authentication type")
     parser.add_argument("--proxy", help="Proxy address for Burp Suite (e.g., 127.0.0.1:8080)")
+    parser.add_argument("--validate", choices=["off", "fast", "full"], default="fast",
+                        help="Validation mode: off (no jsonschema import), fast (default; top-level structure, "
+                             "still imports jsonschema, about 60-70 ms per run) or full (official meta-schema)")
+    parser.add_argument("--compact", action="store_true",
+                        help="Load the spec in memory-compact form (drops descriptions, examples and x- extensions)")
+    parser.add_argument("--compact-cache", action="store_true",
+                        help="Like --compact, and reuse a memory-mapped binary form of the spec across runs")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes for rendering large specs (default: number of CPUs)")
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
-    openapi_data = parse_openapi(args.file)
-    generate_burp_requests(openapi_data, args.host, args.auth_value, args.auth_type, args.proxy)
+    try:
+        openapi_data = parse_openapi(args.file, args.validate, args.compact, args.compact_cache)
+    except SpecValidationError as e:
+        print(f"{e}:\n{format_errors(e.errors)}")
+        sys.exit(1)
+    except MetaSchemaError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    generate_burp_requests(openapi_data, args.host, args.auth_value, args.auth_type, args.proxy, workers=args.workers)
 
 if __name__ == "__main__":
     main()
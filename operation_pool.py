@@ -0,0 +1,45 @@
+import hashlib
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+# Below this many operations, starting worker processes costs more than it saves
+MIN_PARALLEL_OPERATIONS = 500
+
+_worker = None
+
+def _init_worker(render, state):
+    global _worker
+    _worker = (render, state)
+
+def _render(key):
+    render, state = _worker
+    return render(state, key)
+
+def render_operations(render, state, keys, workers=None):
+    """Yield render(state, key) for every key, in order.
+
+    Large inputs are spread over a process pool. render must be a
+    module-level function and must not depend on anything but its
+    arguments. state (typically the spec and the compiled request
+    template) is handed to each worker once, not per operation.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(keys) < MIN_PARALLEL_OPERATIONS:
+        for key in keys:
+            yield render(state, key)
+        return
+
+    chunksize = max(1, len(keys) // (workers * 8))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(render, state)) as pool:
+        yield from pool.map(_render, keys, chunksize=chunksize)
+
+def stable_names(names, keys):
+    """Make file names unique without depending on run order or randomness.
+
+    A name used by more than one operation gets the first 8 hex digits of
+    the SHA-256 of that operation's key (e.g. "GET /users/{id}") appended.
+    """
+    counts = Counter(names)
+    return [f"{name}_{hashlib.sha256(key.encode()).hexdigest()[:8]}" if counts[name] > 1 else name
+            for name, key in zip(names, keys)]
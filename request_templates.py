@@ -0,0 +1,86 @@
+import re
+
+_PATH_SLOT = re.compile(r"\{([^{}]+)\}")
+
+def _encode(value):
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value)
+    return str(value).encode('utf-8')
+
+class RequestTemplate:
+    """Per-run request prefix: the headers that are identical for every operation.
+
+    The static header block (Host, User-Agent, Accept, Authorization, ...) is
+    encoded once; operation() then compiles per-operation skeletons that only
+    fill in their slots when rendered.
+    """
+
+    def __init__(self, headers, newline="\r\n", content_length=True):
+        self.headers = dict(headers)
+        self.newline = newline.encode()
+        self.content_length = content_length
+        self.prefix = b"".join(_encode(f"{name}: {value}") + self.newline for name, value in self.headers.items())
+
+    def operation(self, method, path, headers=None):
+        """Compile an OperationTemplate for method + path ({name} segments become slots)."""
+        if headers and any(name in self.headers for name in headers):
+            # The operation overrides a static header: compile it against a merged prefix
+            merged = RequestTemplate({**self.headers, **headers}, self.newline.decode(), self.content_length)
+            return OperationTemplate(merged, method, path)
+        return OperationTemplate(self, method, path, headers)
+
+class OperationTemplate:
+    """Precompiled skeleton of one operation's request, rendered into bytes."""
+
+    __slots__ = ("template", "method", "path", "headers", "_request_line_start", "_literals", "_slots", "_head")
+
+    def __init__(self, template, method, path, headers=None):
+        self.template = template
+        self.method = method.upper()
+        self.path = path
+        self.headers = dict(headers or {})
+
+        chunks = _PATH_SLOT.split(path)
+        self._literals = [_encode(c) for c in chunks[0::2]]
+        self._slots = chunks[1::2]
+        self._request_line_start = _encode(self.method) + b" "
+
+        newline = template.newline
+        op_headers = b"".join(_encode(f"{name}: {value}") + newline for name, value in self.headers.items())
+        self._head = b" HTTP/1.1" + newline + template.prefix + op_headers
+
+    def render_path(self, values=None, query=None):
+        """Return the request target as bytes, with slots filled from values."""
+        literals = self._literals
+        buf = bytearray(literals[0])
+        for i, name in enumerate(self._slots):
+            if values and name in values:
+                buf += _encode(values[name])
+            else:
+                buf += b"{" + _encode(name) + b"}"
+            buf += literals[i + 1]
+        if query:
+            buf += b"?" + _encode(query)
+        return bytes(buf)
+
+    def render(self, values=None, query=None, body=None):
+        """Render the full raw request as bytes.
+
+        values fills the path slots, query is an already encoded query
+        string, and body (str or bytes) is appended after the blank line.
+        Content-Length is the length of the encoded body.
+        """
+        template = self.template
+        newline = template.newline
+        buf = bytearray(self._request_line_start)
+        buf += self.render_path(values, query)
+        buf += self._head
+        if body is not None:
+            body = _encode(body)
+            if template.content_length:
+                buf += b"Content-Length: %d" % len(body) + newline
+            buf += newline
+            buf += body
+        else:
+            buf += newline
+        return bytes(buf)
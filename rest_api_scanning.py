@@ -0,0 +1,94 @@
+# python3 rest_api_scanning.py sweep -f urls.txt -silent
+# python3 rest_api_scanning.py detect --swagger swagger.json
+# find specs/ -name '*.json' | python3 rest_api_scanning.py batch
+
+import argparse
+import importlib
+import json
+import sys
+
+# Subcommand -> (module, entry point, help). Modules are imported only when
+# their subcommand runs, so requests/jsonschema are never loaded for paths
+# that don't need them.
+COMMANDS = {
+    "sweep": ("api_endpoints_without_auth", "main", "Download specs from URLs and detect public endpoints"),
+    "detect": ("detect_public_endpoints", "cli", "Detect public endpoints in local Swagger JSON files"),
+    "swagger": ("swagger_v1", "cli", "Convert Swagger JSON to Burp Suite requests"),
+    "openapi": ("openapi_parse_v1", "main", "Generate Burp Suite requests from OpenAPI documentation"),
+    "identities": ("multi_identity", "main", "Generate and replay requests under several identities"),
+    "diff": ("spec_diff", "main", "Diff two spec versions and generate requests only for the changes"),
+    "ingest": ("ingest", "main", "Ingest HAR captures, Postman collections or GraphQL introspection dumps"),
+    "watch": ("watch", "main", "Continuously monitor spec URLs and emit change events"),
+    "load": ("load_test", "main", "Replay the generated request set under load and report latency"),
+}
+
+def analyze_spec(spec, session=None, validate="off"):
+    """Return a JSON-serializable result for one spec path or URL."""
+    if spec.startswith(('http://', 'https://')):
+        from api_endpoints_without_auth import detect_public_endpoints, download_swagger
+
+        spec_data = download_swagger(spec, session)
+        if not spec_data:
+            return {"spec": spec, "error": "Failed to download or parse"}
+        endpoints = detect_public_endpoints(spec_data)
+    else:
+        from detect_public_endpoints import find_public_endpoints
+
+        with open(spec, 'r', encoding='utf-8') as f:
+            spec_data = json.load(f)
+        endpoints = find_public_endpoints(spec_data)
+
+    result = {"spec": spec, "public_endpoints": [list(e) for e in endpoints]}
+    if validate != "off":
+        from spec_validation import validate_spec
+
+        result["validation_errors"] = validate_spec(spec_data, validate)
+    return result
+
+def run_batch(lines, out=sys.stdout, validate="off"):
+    """Analyze one spec path or URL per input line, writing one JSON result per line.
+
+    Everything is loaded once, so this replaces shell loops that would
+    otherwise pay interpreter and import startup for every spec. Validation
+    only runs (and jsonschema is only imported) when requested.
+    """
+    session = None
+    for line in lines:
+        spec = line.strip()
+        if not spec or spec.startswith('#'):
+            continue
+        if session is None and spec.startswith(('http://', 'https://')):
+            from api_endpoints_without_auth import create_session
+
+            session = create_session()
+        try:
+            result = analyze_spec(spec, session, validate)
+        except Exception as e:
+            result = {"spec": spec, "error": str(e)}
+        out.write(json.dumps(result) + "\n")
+        out.flush()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="rest-api-scanning", description="REST API scanning toolkit")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for name, (_, _, help_text) in COMMANDS.items():
+        # Options are forwarded untouched to the underlying tool's own parser
+        subparsers.add_parser(name, help=help_text, add_help=False)
+    batch_parser = subparsers.add_parser("batch", help="Read spec paths or URLs from stdin and emit JSON lines")
+    batch_parser.add_argument("--validate", choices=["off", "fast", "full"], default="off",
+                              help="Validation mode for each spec (default: off)")
+
+    args, rest = parser.parse_known_args(argv)
+
+    if args.command == "batch":
+        if rest:
+            parser.error(f"unrecognized arguments: {' '.join(rest)}")
+        run_batch(sys.stdin, validate=args.validate)
+        return
+
+    module_name, entry_point, _ = COMMANDS[args.command]
+    module = importlib.import_module(module_name)
+    getattr(module, entry_point)(rest)
+
+if __name__ == "__main__":
+    main()
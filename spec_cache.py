@@ -0,0 +1,61 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+def cache_dir(*parts):
+    """Return (and create) a directory under the on-disk cache.
+
+    Defaults to ~/.cache/rest-api-scanning; override with REST_API_SCANNING_CACHE.
+    """
+    base = os.environ.get("REST_API_SCANNING_CACHE") or os.path.join(os.path.expanduser("~"), ".cache", "rest-api-scanning")
+    path = os.path.join(base, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def spec_digest(content):
+    """Return the SHA-256 hex digest of a raw spec body."""
+    return hashlib.sha256(content).hexdigest()
+
+class SpecCache:
+    """Bounded LRU of analysis results keyed by spec content digest.
+
+    Lets byte-identical specs served from many URLs (shared gateways,
+    framework defaults) be parsed and analyzed once per run. Also counts
+    how many URLs returned each digest, independently of eviction.
+    Safe to share between sweep worker threads.
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._urls = {}
+        self._lock = threading.Lock()
+
+    def get(self, digest):
+        """Return the cached entry for digest, or None."""
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is not None:
+                self._entries.move_to_end(digest)
+            return entry
+
+    def put(self, digest, entry):
+        """Cache entry under digest, evicting the least recently used one if full."""
+        with self._lock:
+            self._entries[digest] = entry
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def add_url(self, digest, url):
+        """Record that url served the spec with this digest."""
+        with self._lock:
+            self._urls.setdefault(digest, []).append(url)
+
+    def share_count(self, digest):
+        """Number of URLs seen serving this digest."""
+        return len(self._urls.get(digest, ()))
+
+    def __len__(self):
+        return len(self._entries)
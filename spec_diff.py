@@ -0,0 +1,269 @@
+# python3 spec_diff.py --old openapi_v1.json --new openapi_v2.json
+# python3 spec_diff.py --old openapi_v1.json --new openapi_v2.json --generate --host api.example.com --proxy 127.0.0.1:8080
+
+import argparse
+import copy
+import hashlib
+import json
+import sys
+
+from spec_validation import spec_version
+
+HTTP_METHODS = {"get", "post", "put", "delete", "patch", "options", "head"}
+
+# Keys that never change what a request looks like or who may send it
+IGNORED_KEYS = {"description", "summary", "example", "examples", "externalDocs", "tags", "operationId", "deprecated"}
+
+# Keys whose value maps property names to schemas: a property called
+# "description" or "x-tenant" is part of the request, not documentation
+NAME_MAP_KEYS = {"properties", "patternProperties"}
+
+class Fingerprinter:
+    """Stable digests of spec fragments with local $refs resolved.
+
+    A referenced component is hashed once and its digest is substituted for the
+    $ref. A change inside a shared schema therefore shows up in every operation
+    that uses it. Refs that reach each other (recursive schemas) form a
+    strongly connected component that is hashed as one unit, so a change in
+    any member changes the digest of every member, whatever order they are
+    visited in.
+    """
+
+    def __init__(self, spec):
+        self.spec = spec
+        self._ref_digests = {}
+
+    def _lookup(self, ref):
+        node = self.spec
+        for part in ref[2:].split('/'):
+            part = part.replace("~1", "/").replace("~0", "~")
+            if not isinstance(node, dict) or part not in node:
+                return None
+            node = node[part]
+        return node
+
+    def _target(self, ref):
+        return self._lookup(ref) if ref.startswith("#/") else None
+
+    def _refs_in(self, node, names=False, refs=None):
+        """The $refs _normalize() would substitute in node, in document order."""
+        refs = [] if refs is None else refs
+        if isinstance(node, dict):
+            ref = None if names else node.get("$ref")
+            if isinstance(ref, str):
+                refs.append(ref)
+            else:
+                for k, v in node.items():
+                    if names:
+                        self._refs_in(v, False, refs)
+                    elif k not in IGNORED_KEYS and not k.startswith("x-"):
+                        self._refs_in(v, k in NAME_MAP_KEYS, refs)
+        elif isinstance(node, list):
+            for item in node:
+                self._refs_in(item, False, refs)
+        return refs
+
+    def _ref_digest(self, ref):
+        if ref not in self._ref_digests:
+            self._digest_components(ref)
+        return self._ref_digests[ref]
+
+    def _digest_components(self, root):
+        """Digest every ref reachable from root, one strongly connected component at a time.
+
+        Tarjan's algorithm completes a component only after every component
+        it points to, so refs leaving a component are already digested.
+        """
+        index = {}
+        low = {}
+        stack = []
+        on_stack = set()
+
+        def visit(ref):
+            index[ref] = low[ref] = len(index)
+            stack.append(ref)
+            on_stack.add(ref)
+            target = self._target(ref)
+            for succ in self._refs_in(target) if target is not None else []:
+                if succ in self._ref_digests:
+                    continue
+                if succ not in index:
+                    visit(succ)
+                    low[ref] = min(low[ref], low[succ])
+                elif succ in on_stack:
+                    low[ref] = min(low[ref], index[succ])
+            if low[ref] == index[ref]:
+                component = []
+                while not component or component[-1] != ref:
+                    component.append(stack.pop())
+                    on_stack.discard(component[-1])
+                self._digest_component(component)
+
+        visit(root)
+
+    def _digest_component(self, component):
+        if len(component) == 1:
+            ref = component[0]
+            target = self._target(ref)
+            if target is None:
+                self._ref_digests[ref] = "unresolved:" + ref
+                return
+            if ref not in self._refs_in(target):
+                self._ref_digests[ref] = "ref:" + self.digest(target)
+                return
+        # Recursive: members refer to each other by name, everything else by digest
+        members = frozenset(component)
+        parts = {}
+        for ref in sorted(members):
+            target = self._target(ref)
+            parts[ref] = self._normalize(target, members=members) if target is not None else "unresolved:" + ref
+        group = hashlib.sha256(json.dumps(parts, sort_keys=True, separators=(',', ':')).encode()).hexdigest()
+        for ref in members:
+            self._ref_digests[ref] = "ref:" + hashlib.sha256(f"{group}:{ref}".encode()).hexdigest()
+
+    def _normalize(self, node, names=False, members=frozenset()):
+        if isinstance(node, dict):
+            if names:
+                return {k: self._normalize(v, members=members) for k, v in node.items()}
+            ref = node.get("$ref")
+            if isinstance(ref, str):
+                return "member:" + ref if ref in members else self._ref_digest(ref)
+            return {k: self._normalize(v, k in NAME_MAP_KEYS, members) for k, v in node.items()
+                    if k not in IGNORED_KEYS and not k.startswith("x-")}
+        if isinstance(node, list):
+            return [self._normalize(item, members=members) for item in node]
+        return node
+
+    def digest(self, node):
+        canonical = json.dumps(self._normalize(node), sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+def operation_index(spec):
+    """Map (METHOD, path) to per-aspect digests of params, body and security."""
+    fingerprinter = Fingerprinter(spec)
+    global_security = spec.get("security")
+    index = {}
+    for path, methods in spec.get("paths", {}).items():
+        if not isinstance(methods, dict):
+            continue
+        path_params = methods.get("parameters", [])
+        for method, operation in methods.items():
+            if method.lower() not in HTTP_METHODS or not isinstance(operation, dict):
+                continue
+            # Operation-level parameters override path-level ones with the same (in, name)
+            params = {}
+            for param in path_params + operation.get("parameters", []):
+                resolved = param
+                if isinstance(param, dict) and "$ref" in param:
+                    resolved = fingerprinter._lookup(param["$ref"]) or param
+                key = (resolved.get("in"), resolved.get("name")) if isinstance(resolved, dict) else (None, str(param))
+                params[key] = param
+            # Swagger 2 bodies are parameters; keep them in the body aspect
+            body_params = [params.pop(k) for k in list(params) if k[0] in ("body", "formData")]
+            body = operation.get("requestBody") if "requestBody" in operation else body_params
+            index[(method.upper(), path)] = {
+                "params": fingerprinter.digest([params[k] for k in sorted(params, key=str)]),
+                "body": fingerprinter.digest(body),
+                "security": fingerprinter.digest(operation.get("security", global_security)),
+            }
+    return index
+
+def diff_specs(old_spec, new_spec):
+    """Structural diff of two spec versions at the operation level."""
+    old_index = operation_index(old_spec)
+    new_index = operation_index(new_spec)
+    added = sorted(k for k in new_index if k not in old_index)
+    removed = sorted(k for k in old_index if k not in new_index)
+    changed = []
+    for key in sorted(k for k in new_index if k in old_index):
+        aspects = [aspect for aspect in ("params", "body", "security") if old_index[key][aspect] != new_index[key][aspect]]
+        if aspects:
+            changed.append((key, aspects))
+    return {"added": added, "removed": removed, "changed": changed}
+
+def delta_spec(new_spec, diff):
+    """Copy of new_spec whose paths only contain added and changed operations."""
+    keep = set(diff["added"]) | {key for key, _ in diff["changed"]}
+    spec = copy.copy(new_spec)
+    paths = {}
+    for path, methods in new_spec.get("paths", {}).items():
+        kept = {m: op for m, op in methods.items()
+                if m.lower() not in HTTP_METHODS or (m.upper(), path) in keep}
+        if any(m.lower() in HTTP_METHODS for m in kept):
+            paths[path] = kept
+    spec["paths"] = paths
+    return spec
+
+def format_diff(diff):
+    lines = []
+    for method, path in diff["added"]:
+        lines.append(f"  + {method} {path}")
+    for (method, path), aspects in diff["changed"]:
+        lines.append(f"  ~ {method} {path} ({', '.join(aspects)})")
+    for method, path in diff["removed"]:
+        lines.append(f"  - {method} {path}")
+    if not lines:
+        lines.append("  No operation changes.")
+    return "\n".join(lines)
+
+def generate_delta(spec, host, output_dir, auth_value=None, auth_type="bearer", proxy=None):
+    """Generate (and optionally send to the proxy) Burp requests for a delta spec."""
+    if spec_version(spec) == "2.0":
+        import swagger_v1
+        from openapi_parse_v1 import get_auth_headers
+
+        auth_headers = get_auth_headers(spec, auth_value, auth_type)
+        proxy_url = proxy if not proxy or proxy.startswith(("http://", "https://")) else f"http://{proxy}"
+        swagger_v1.generate_from_spec(spec, output_dir, None, host, proxy_url, auth_headers=auth_headers)
+    else:
+        import openapi_parse_v1
+
+        openapi_parse_v1.generate_burp_requests(spec, host, auth_value, auth_type, proxy, output_dir)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Diff two spec versions and generate requests only for new or changed operations")
+    parser.add_argument("--old", required=True, help="Previous spec JSON file")
+    parser.add_argument("--new", required=True, help="Current spec JSON file")
+    parser.add_argument("--json", action="store_true", help="Print the diff as JSON")
+    parser.add_argument("--delta-spec", help="Write a spec with only the added/changed operations (e.g. for nuclei -im openapi)")
+    parser.add_argument("--generate", action="store_true", help="Generate Burp requests for the added/changed operations")
+    parser.add_argument("--host", help="Host header for generated requests")
+    parser.add_argument("--output-dir", default="burp_requests_delta", help="Directory for delta requests (default: burp_requests_delta)")
+    parser.add_argument("--auth-value", help="Authentication value (Bearer token, API key, or user:pass for Basic Auth)")
+    parser.add_argument("--auth-type", choices=["bearer", "apiKey", "basic"], default="bearer", help="Authentication type")
+    parser.add_argument("--proxy", help="Proxy address to replay the delta through (e.g., 127.0.0.1:8080)")
+    args = parser.parse_args(argv)
+
+    if args.generate and not args.host:
+        parser.error("--generate requires --host")
+
+    try:
+        with open(args.old, 'r', encoding='utf-8') as f:
+            old_spec = json.load(f)
+        with open(args.new, 'r', encoding='utf-8') as f:
+            new_spec = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"Error reading spec: {e}")
+        sys.exit(1)
+
+    diff = diff_specs(old_spec, new_spec)
+    if args.json:
+        print(json.dumps({
+            "added": [" ".join(k) for k in diff["added"]],
+            "removed": [" ".join(k) for k in diff["removed"]],
+            "changed": [{"operation": " ".join(k), "aspects": aspects} for k, aspects in diff["changed"]],
+        }, indent=2))
+    else:
+        print(f"Changes from {args.old} to {args.new}:")
+        print(format_diff(diff))
+
+    if args.delta_spec or args.generate:
+        spec = delta_spec(new_spec, diff)
+        if args.delta_spec:
+            with open(args.delta_spec, 'w', encoding='utf-8') as f:
+                json.dump(spec, f, indent=2)
+        if args.generate:
+            generate_delta(spec, args.host, args.output_dir, args.auth_value, args.auth_type, args.proxy)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+import json
+import os
+from functools import lru_cache
+
+from spec_cache import cache_dir
+
+VALIDATION_MODES = ("off", "fast", "full")
+
+# Official meta-schemas, downloaded once and cached under cache_dir("schemas")
+META_SCHEMA_URLS = {
+    "2.0": "https://spec.openapis.org/oas/2.0/schema/2017-08-27",
+    "3.0": "https://spec.openapis.org/oas/3.0/schema/2021-09-28",
+    "3.1": "https://spec.openapis.org/oas/3.1/schema/2022-10-07",
+}
+
+_INFO = {
+    "type": "object",
+    "required": ["title", "version"],
+    "properties": {"title": {"type": "string"}, "version": {"type": "string"}},
+}
+
+_PATHS = {
+    "type": "object",
+    "patternProperties": {"^/": {"type": "object"}},
+}
+
+# Top-level structure checks for --validate=fast, one per spec version
+FAST_SCHEMAS = {
+    "2.0": {
+        "type": "object",
+        "required": ["swagger", "info", "paths"],
+        "properties": {
+            "swagger": {"enum": ["2.0"]},
+            "info": _INFO,
+            "paths": _PATHS,
+            "definitions": {"type": "object"},
+            "securityDefinitions": {"type": "object"},
+            "security": {"type": "array"},
+        },
+    },
+    "3.0": {
+        "type": "object",
+        "required": ["openapi", "info", "paths"],
+        "properties": {
+            "openapi": {"type": "string", "pattern": "^3\\.0\\.\\d+"},
+            "info": _INFO,
+            "paths": _PATHS,
+            "components": {"type": "object"},
+            "security": {"type": "array"},
+        },
+    },
+    "3.1": {
+        "type": "object",
+        "required": ["openapi", "info"],
+        "anyOf": [{"required": ["paths"]}, {"required": ["components"]}, {"required": ["webhooks"]}],
+        "properties": {
+            "openapi": {"type": "string", "pattern": "^3\\.1\\.\\d+"},
+            "info": _INFO,
+            "paths": _PATHS,
+            "components": {"type": "object"},
+            "webhooks": {"type": "object"},
+            "security": {"type": "array"},
+        },
+    },
+}
+
+class SpecValidationError(ValueError):
+    """Raised when a spec fails validation; `errors` holds structured locations."""
+
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__(f"Invalid OpenAPI document ({len(errors)} error(s))")
+
+class MetaSchemaError(RuntimeError):
+    """Raised when the official meta-schema for --validate=full cannot be obtained."""
+
+def spec_version(data):
+    """Return "2.0", "3.0" or "3.1" for a spec document, or None if unrecognized."""
+    if not isinstance(data, dict):
+        return None
+    if str(data.get("swagger", "")).startswith("2."):
+        return "2.0"
+    openapi = str(data.get("openapi", ""))
+    for version in ("3.0", "3.1"):
+        if openapi.startswith(version + "."):
+            return version
+    return None
+
+def load_meta_schema(version):
+    """Return the official meta-schema for version, downloading it on first use.
+
+    Raises MetaSchemaError when it is not cached and cannot be downloaded.
+    """
+    path = os.path.join(cache_dir("schemas"), f"openapi-{version}.json")
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    import requests
+
+    url = META_SCHEMA_URLS[version]
+    try:
+        response = requests.get(url, timeout=30)
+        response.raise_for_status()
+        schema = response.json()
+    except (requests.RequestException, ValueError) as e:
+        raise MetaSchemaError(f"Could not download the OpenAPI {version} meta-schema from {url}: {e}") from None
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(schema, f)
+    return schema
+
+@lru_cache(maxsize=None)
+def get_validator(version, mode):
+    """Build the validator for (version, mode) once per process."""
+    from jsonschema.validators import validator_for
+
+    schema = FAST_SCHEMAS[version] if mode == "fast" else load_meta_schema(version)
+    cls = validator_for(schema)
+    cls.check_schema(schema)
+    return cls(schema)
+
+def _pointer(parts):
+    """Format a jsonschema error path as a JSON pointer."""
+    return "/" + "/".join(str(p).replace("~", "~0").replace("/", "~1") for p in parts)
+
+def _format_error(error):
+    from jsonschema.exceptions import best_match
+
+    # For anyOf/oneOf failures report the most relevant sub-error instead
+    if error.context:
+        error = best_match(error.context)
+    return {
+        "location": _pointer(error.absolute_path),
+        "message": error.message,
+        "validator": error.validator,
+    }
+
+def validate_spec(data, mode="fast", max_errors=50):
+    """Validate a spec document and return a list of structured errors (empty if valid).
+
+    mode is one of VALIDATION_MODES: "off" skips validation, "fast" checks the
+    top-level structure, "full" validates against the official meta-schema.
+    """
+    if mode == "off":
+        return []
+    if mode not in VALIDATION_MODES:
+        raise ValueError(f"Unknown validation mode: {mode}")
+
+    version = spec_version(data)
+    if version is None:
+        return [{
+            "location": "/",
+            "message": "Not a Swagger 2.0 or OpenAPI 3.0/3.1 document (missing or unsupported 'swagger'/'openapi' version)",
+            "validator": "version",
+        }]
+
+    validator = get_validator(version, mode)
+    errors = []
+    for error in sorted(validator.iter_errors(data), key=lambda e: list(map(str, e.absolute_path))):
+        errors.append(_format_error(error))
+        if len(errors) >= max_errors:
+            break
+    return errors
+
+def format_errors(errors):
+    """Render structured validation errors one per line."""
+    return "\n".join(f"  {e['location']}: {e['message']}" for e in errors)
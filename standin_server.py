@@ -0,0 +1,190 @@
+# python3 standin_server.py --port 8080
+# python3 standin_server.py --port 8080 --spec openapi.json --latency 0.05
+
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Default spec: one operation per behaviour the scanners need to tell apart.
+# x-standin-status overrides the response the server gives without credentials.
+DEFAULT_SPEC = {
+    "swagger": "2.0",
+    "info": {"title": "Stand-in API", "version": "1.0"},
+    "basePath": "/api",
+    "securityDefinitions": {"bearer": {"type": "apiKey", "name": "Authorization", "in": "header"}},
+    "security": [{"bearer": []}],
+    "paths": {
+        "/health": {"get": {"operationId": "health", "security": []}},
+        "/users": {
+            "get": {"operationId": "listUsers"},
+            "post": {"operationId": "createUser", "parameters": [
+                {"name": "body", "in": "body", "schema": {"properties": {"name": {"type": "string"}}}}]},
+        },
+        "/users/{id}": {"get": {"operationId": "getUser", "parameters": [
+            {"name": "id", "in": "path", "required": True, "type": "string"}]}},
+        "/reports": {"get": {"operationId": "listReports", "x-standin-status": 200}},
+        "/docs/public": {"get": {"operationId": "publicDocs", "security": [], "x-standin-status": 401}},
+        "/admin": {"get": {"operationId": "admin", "x-standin-status": 302}},
+        "/internal": {"get": {"operationId": "internal", "x-standin-status": 403}},
+    },
+}
+
+SPEC_PATHS = ("/swagger.json", "/openapi.json", "/v2/api-docs", "/v3/api-docs")
+
+# JSON POSTed here is recorded instead of routed, so the server can stand in for a webhook
+EVENTS_PATH = "/events"
+
+def compile_routes(spec):
+    """Turn the spec's paths into (regex, method, operation) routes."""
+    base_path = spec.get("basePath", "").rstrip('/')
+    servers = spec.get("servers") or []
+    if servers and servers[0].get("url", "").startswith('/'):
+        base_path = servers[0]["url"].rstrip('/')
+    routes = []
+    for path, methods in spec.get("paths", {}).items():
+        pattern = re.escape(base_path + path)
+        pattern = re.sub(r"\\\{[^/]+?\\\}", "[^/]+", pattern)
+        for method, operation in methods.items():
+            if isinstance(operation, dict):
+                routes.append((re.compile(f"^{pattern}$"), method.upper(), operation))
+    return routes
+
+class StandinServer(ThreadingHTTPServer):
+    """Local HTTP server that serves a spec and answers its operations.
+
+    Operations declared public answer 200. Everything else answers 401
+    unless an Authorization or X-API-Key header is sent (with tokens, only
+    one carrying one of those values counts). x-standin-status
+    overrides the credential-less response (302 redirects to /login).
+    JSON POSTed to /events is kept in `events` (webhook stand-in).
+    """
+
+    daemon_threads = True
+    # Room for load tests that open many connections at once
+    request_queue_size = 128
+
+    def __init__(self, address, spec=None, latency=0.0, events_log=None, tokens=None):
+        self.spec = spec or DEFAULT_SPEC
+        self.tokens = set(tokens) if tokens else None
+        self.spec_body = json.dumps(self.spec).encode()
+        self.events = []
+        self.events_log = events_log
+        self.routes = compile_routes(self.spec)
+        self.latency = latency
+        self.request_count = 0
+        self._count_lock = threading.Lock()
+        super().__init__(address, StandinHandler)
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Serve in a background thread; returns the thread."""
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+    def authenticated(self, headers):
+        """True if the request carries credentials the server accepts."""
+        credentials = [value for value in (headers.get("Authorization"), headers.get("X-API-Key")) if value]
+        if self.tokens is None:
+            return bool(credentials)
+        return any(value.split(" ")[-1] in self.tokens for value in credentials)
+
+    def status_for(self, method, path, authenticated):
+        """Status code for a request, following the matched operation's declared security."""
+        global_security = self.spec.get("security")
+        for pattern, route_method, operation in self.routes:
+            if route_method != method or not pattern.match(path):
+                continue
+            if not authenticated and "x-standin-status" in operation:
+                return operation["x-standin-status"]
+            if authenticated or not operation.get("security", global_security):
+                return 200
+            return 401
+        return 404
+
+class StandinHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes; with Nagle, keep-alive clients wait on delayed ACKs
+    disable_nagle_algorithm = True
+
+    def _respond(self):
+        server = self.server
+        with server._count_lock:
+            server.request_count += 1
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        if server.latency:
+            time.sleep(server.latency)
+
+        path = self.path.split('?', 1)[0]
+        if self.command == "POST" and path == EVENTS_PATH:
+            return self._record_event(body)
+        if self.command == "GET" and path in SPEC_PATHS:
+            return self._send(200, server.spec_body, "application/json")
+
+        status = server.status_for(self.command, path, server.authenticated(self.headers))
+        if 300 <= status < 400:
+            return self._send(status, b"", extra={"Location": "/login?next=" + path})
+        body = json.dumps({"status": status}).encode()
+        return self._send(status, body, "application/json")
+
+    def _record_event(self, body):
+        server = self.server
+        try:
+            event = json.loads(body)
+        except ValueError:
+            return self._send(400, b"")
+        with server._count_lock:
+            server.events.append(event)
+            if server.events_log:
+                with open(server.events_log, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(event) + "\n")
+        return self._send(204, b"")
+
+    def _send(self, status, body, content_type="text/plain", extra=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (extra or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_HEAD = do_OPTIONS = _respond
+
+    def log_message(self, format, *args):
+        pass
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in API server for exercising the scanners")
+    parser.add_argument('--host', default="127.0.0.1", help='Address to bind (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8080, help='Port to listen on (default: 8080)')
+    parser.add_argument('--spec', help='Spec JSON to serve instead of the built-in one')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds to delay every response')
+    parser.add_argument('--events-log', help='Append JSON POSTed to /events to this JSONL file')
+    parser.add_argument('--token', action='append', dest='tokens',
+                        help='Only accept this Bearer token / API key (repeatable; default: any credential)')
+    args = parser.parse_args()
+
+    spec = None
+    if args.spec:
+        with open(args.spec, 'r', encoding='utf-8') as f:
+            spec = json.load(f)
+
+    server = StandinServer((args.host, args.port), spec, args.latency, args.events_log, args.tokens)
+    print(f"Serving stand-in API on {server.base_url} (spec at {server.base_url}/swagger.json)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
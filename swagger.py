@@ -3,6 +3,7 @@ import os
 import shutil
 import argparse
 from urllib.parse import urlencode
+from request_templates import RequestTemplate
 
 def load_swagger_file(file_path):
     """Load and parse the Swagger JSON file."""
@@ -64,13 +65,8 @@ def generate_sample_body(schema_ref, definitions=None, required_fields=None, dep
 
     return sample_body
 
-def generate_burp_request(method, path, host, base_path, schemes, parameters, operation_id, body_schema=None, definitions=None, token=None, custom_host=None):
-    """Generate a Burp Suite-compatible HTTP request string."""
-    # Use only the path for the request line, normalize to avoid double slashes
-    request_path = f"{base_path}{path}".replace('//', '/')
-    
-    # Initialize query parameters
-    query_params = []
+def create_request_template(host, token=None, custom_host=None):
+    """Compile the headers shared by every request in a run."""
     headers = {
         "Host": custom_host if custom_host else host,
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
@@ -81,6 +77,20 @@ def generate_burp_request(method, path, host, base_path, schemes, parameters, op
     # Add Authorization header if token is provided
     if token:
         headers["Authorization"] = f"Bearer {token}"
+    
+    return RequestTemplate(headers, newline="\n")
+
+def generate_burp_request(method, path, host, base_path, schemes, parameters, operation_id, body_schema=None, definitions=None, token=None, custom_host=None, template=None):
+    """Generate a Burp Suite-compatible HTTP request as bytes."""
+    if template is None:
+        template = create_request_template(host, token, custom_host)
+    
+    # Use only the path for the request line, normalize to avoid double slashes
+    request_path = f"{base_path}{path}".replace('//', '/')
+    
+    # Initialize query parameters and operation-specific headers
+    query_params = []
+    headers = {}
 
     body = ""
 
@@ -115,19 +125,12 @@ def generate_burp_request(method, path, host, base_path, schemes, parameters, op
     # Normalize path again to handle any double slashes introduced by query params
     request_path = request_path.replace('//', '/')
 
-    # Construct the HTTP request
-    request_lines = [
-        f"{method.upper()} {request_path} HTTP/1.1"
-    ]
-    for header, value in headers.items():
-        request_lines.append(f"{header}: {value}")
-
-    # Add body if present for POST, PUT, PATCH, DELETE
-    if body and method.upper() in ['POST', 'PUT', 'PATCH', 'DELETE']:
-        request_lines.append("")
-        request_lines.append(body)
+    # Render the request from the compiled template, body only for methods that carry one
+    if not (body and method.upper() in ['POST', 'PUT', 'PATCH', 'DELETE']):
+        body = None
+    request = template.operation(method, request_path, headers).render(body=body)
 
-    return "\n".join(request_lines)
+    return request
 
 def save_burp_request(request, operation_id, output_dir):
     """Save the Burp request to a file."""
@@ -138,7 +141,7 @@ def save_burp_request(request, operation_id, output_dir):
     safe_operation_id = operation_id.replace('/', '_').replace(' ', '_')
     file_path = os.path.join(output_dir, f"{safe_operation_id}.txt")
     
-    with open(file_path, 'w') as f:
+    with open(file_path, 'wb' if isinstance(request, bytes) else 'w') as f:
         f.write(request)
 
 def main(swagger_file, output_dir, token=None, custom_host=None):
@@ -157,6 +160,7 @@ def main(swagger_file, output_dir, token=None, custom_host=None):
     schemes = swagger_data.get('schemes', ['https'])
     paths = swagger_data.get('paths', {})
     definitions = swagger_data.get('definitions', {})
+    template = create_request_template(host, token, custom_host)
 
     for path, methods in paths.items():
         for method, details in methods.items():
@@ -167,7 +171,7 @@ def main(swagger_file, output_dir, token=None, custom_host=None):
                 if param.get('in') == 'body':
                     body_schema = param.get('schema', {})
             
-            request = generate_burp_request(method, path, host, base_path, schemes, parameters, operation_id, body_schema, definitions, token, custom_host)
+            request = generate_burp_request(method, path, host, base_path, schemes, parameters, operation_id, body_schema, definitions, token, custom_host, template)
             save_burp_request(request, operation_id, output_dir)
             print(f"Generated Burp request for {operation_id}")
 
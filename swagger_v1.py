@@ -4,16 +4,16 @@ import json
 import os
 import shutil
 import argparse
-import requests
 from urllib.parse import urlencode
-import urllib3
+from compact_spec import load_spec
+from request_templates import RequestTemplate
 
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+# Headers that carry the credentials of a run
+AUTH_HEADERS = {"authorization", "x-api-key"}
 
-def load_swagger_file(file_path):
-    """Load and parse the Swagger JSON file."""
-    with open(file_path, 'r') as f:
-        return json.load(f)
+def load_swagger_file(file_path, compact=False, compact_cache=False):
+    """Load and parse the Swagger JSON file, optionally in memory-compact form."""
+    return load_spec(file_path, compact, compact_cache)
 
 def generate_sample_body(schema_ref, definitions=None, required_fields=None, depth=0, max_depth=5):
     """Generate a sample JSON body based on the schema, including required and optional fields."""
@@ -70,13 +70,12 @@ def generate_sample_body(schema_ref, definitions=None, required_fields=None, dep
 
     return sample_body
 
-def generate_burp_request(method, path, host, base_path, schemes, parameters, operation_id, body_schema=None, definitions=None, token=None, custom_host=None):
-    """Generate a Burp Suite-compatible HTTP request string."""
-    # Use only the path for the request line, normalize to avoid double slashes
-    request_path = f"{base_path}{path}".replace('//', '/')
-    
-    # Initialize query parameters
-    query_params = []
+def create_request_template(host, token=None, custom_host=None, auth_headers=None):
+    """Compile the headers shared by every request in a run.
+
+    auth_headers (e.g. from openapi_parse_v1.get_auth_headers) carries API key
+    or Basic credentials; token is the Bearer shortcut used by the CLI.
+    """
     headers = {
         "Host": custom_host if custom_host else host,
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
@@ -87,6 +86,18 @@ def generate_burp_request(method, path, host, base_path, schemes, parameters, op
     # Add Authorization header if token is provided
     if token:
         headers["Authorization"] = f"Bearer {token}"
+    headers.update(auth_headers or {})
+    
+    return RequestTemplate(headers, newline="\n")
+
+def build_operation(method, path, base_path, parameters, body_schema=None, definitions=None, token=None):
+    """Build the request path, operation-specific headers and body for one operation."""
+    # Use only the path for the request line, normalize to avoid double slashes
+    request_path = f"{base_path}{path}".replace('//', '/')
+    
+    # Initialize query parameters and operation-specific headers
+    query_params = []
+    headers = {}
 
     body = ""
 
@@ -121,22 +132,32 @@ def generate_burp_request(method, path, host, base_path, schemes, parameters, op
     # Normalize path again to handle any double slashes introduced by query params
     request_path = request_path.replace('//', '/')
 
-    # Construct the HTTP request
-    request_lines = [
-        f"{method.upper()} {request_path} HTTP/1.1"
-    ]
-    for header, value in headers.items():
-        request_lines.append(f"{header}: {value}")
+    # Keep the body only for methods that carry one
+    if not (body and method.upper() in ['POST', 'PUT', 'PATCH', 'DELETE']):
+        body = None
 
-    # Add body if present for POST, PUT, PATCH, DELETE
-    if body and method.upper() in ['POST', 'PUT', 'PATCH', 'DELETE']:
-        request_lines.append("")
-        request_lines.append(body)
+    return request_path, headers, body
 
-    return "\n".join(request_lines), headers, body, request_path
+def generate_burp_request(method, path, host, base_path, schemes, parameters, operation_id, body_schema=None, definitions=None, token=None, custom_host=None, template=None):
+    """Generate a Burp Suite-compatible HTTP request as bytes."""
+    if template is None:
+        template = create_request_template(host, token, custom_host)
+
+    request_path, headers, body = build_operation(method, path, base_path, parameters, body_schema, definitions, token)
+    # A spec's auth header parameter never replaces the run's credentials
+    run_headers = {name.lower() for name in template.headers}
+    headers = {name: value for name, value in headers.items()
+               if name.lower() not in AUTH_HEADERS or name.lower() not in run_headers}
+    request = template.operation(method, request_path, headers).render(body=body)
+
+    return request, {**template.headers, **headers}, body, request_path
 
 def send_to_burp(method, request_path, headers, body, scheme, host, proxy):
     """Send the HTTP request to Burp Suite via the specified proxy."""
+    import requests
+    import urllib3
+
+    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
     url = f"{scheme}://{host}{request_path}"
     proxies = {
         "http": proxy,
@@ -165,11 +186,44 @@ def save_burp_request(request, operation_id, output_dir):
     safe_operation_id = operation_id.replace('/', '_').replace(' ', '_')
     file_path = os.path.join(output_dir, f"{safe_operation_id}.txt")
     
-    with open(file_path, 'w') as f:
+    with open(file_path, 'wb' if isinstance(request, bytes) else 'w') as f:
         f.write(request)
 
-def main(swagger_file, output_dir, token=None, custom_host=None, proxy=None):
+def main(swagger_file, output_dir, token=None, custom_host=None, proxy=None, compact=False, compact_cache=False, workers=None):
     """Main function to process Swagger JSON and generate Burp requests."""
+    swagger_data = load_swagger_file(swagger_file, compact, compact_cache)
+    generate_from_spec(swagger_data, output_dir, token, custom_host, proxy, workers)
+
+HTTP_METHODS = {"get", "post", "put", "delete", "patch", "options", "head"}
+
+def render_operation(state, key):
+    """Build and render one (path, method) operation.
+
+    Pure: the result depends only on the state and key, so operations can be
+    rendered in any process and in any order.
+    """
+    swagger_data, host, token, custom_host, template = state
+    path, method = key
+    details = swagger_data['paths'][path][method]
+    parameters = details.get('parameters', [])
+    body_schema = None
+    for param in parameters:
+        if param.get('in') == 'body':
+            body_schema = param.get('schema', {})
+    return generate_burp_request(method, path, host, swagger_data.get('basePath', '/'), swagger_data.get('schemes', ['https']),
+                                 parameters, details.get('operationId'), body_schema, swagger_data.get('definitions', {}),
+                                 token, custom_host, template)
+
+def generate_from_spec(swagger_data, output_dir, token=None, custom_host=None, proxy=None, workers=None, auth_headers=None):
+    """Generate Burp requests for every operation of an already loaded Swagger document.
+
+    Rendering is spread over worker processes for large specs; files are
+    written (and proxied) in spec order. An operationId shared by several
+    operations gets a hash of method and path appended instead of the last
+    one overwriting the others.
+    """
+    from operation_pool import render_operations, stable_names
+
     # Delete the output directory if it exists
     if os.path.exists(output_dir):
         shutil.rmtree(output_dir)
@@ -177,43 +231,43 @@ def main(swagger_file, output_dir, token=None, custom_host=None, proxy=None):
     # Create a new output directory
     os.makedirs(output_dir)
     
-    swagger_data = load_swagger_file(swagger_file)
-    
     # Use custom_host if provided, otherwise fall back to swagger_data host
     host = custom_host if custom_host else swagger_data.get('host', 'example.com')
-    base_path = swagger_data.get('basePath', '/')
     schemes = swagger_data.get('schemes', ['https'])
     paths = swagger_data.get('paths', {})
-    definitions = swagger_data.get('definitions', {})
-
-    for path, methods in paths.items():
-        for method, details in methods.items():
-            operation_id = details.get('operationId', f"{method}_{path.replace('/', '_')}")
-            parameters = details.get('parameters', [])
-            body_schema = None
-            for param in parameters:
-                if param.get('in') == 'body':
-                    body_schema = param.get('schema', {})
-            
-            # Generate the request and extract components for sending
-            request, headers, body, request_path = generate_burp_request(method, path, host, base_path, schemes, parameters, operation_id, body_schema, definitions, token, custom_host)
-            
-            # Save the request to a file
-            save_burp_request(request, operation_id, output_dir)
-            print(f"Generated Burp request for {operation_id}")
-
-            # Send to Burp Suite if proxy is specified
-            if proxy:
-                scheme = schemes[0] if schemes else 'https'
-                send_to_burp(method, request_path, headers, body, scheme, host, proxy)
+    template = create_request_template(host, token, custom_host, auth_headers)
 
-if __name__ == "__main__":
+    # Path-level keys such as "parameters" are not operations
+    keys = [(path, method) for path, methods in paths.items() for method, details in methods.items()
+            if method.lower() in HTTP_METHODS and isinstance(details, dict)]
+    names = [paths[path][method].get('operationId', f"{method}_{path.replace('/', '_')}") for path, method in keys]
+    names = stable_names(names, [f"{method.upper()} {path}" for path, method in keys])
+
+    rendered = render_operations(render_operation, (swagger_data, host, token, custom_host, template), keys, workers)
+    for operation_id, (path, method), (request, headers, body, request_path) in zip(names, keys, rendered):
+        # Save the request to a file
+        save_burp_request(request, operation_id, output_dir)
+        print(f"Generated Burp request for {operation_id}")
+
+        # Send to Burp Suite if specified
+        if proxy:
+            scheme = schemes[0] if schemes else 'https'
+            send_to_burp(method, request_path, headers, body, scheme, host, proxy)
+
+def cli(argv=None):
+    """Parse command line arguments and run main()."""
     parser = argparse.ArgumentParser(description="Convert Swagger JSON to Burp Suite requests")
     parser.add_argument('-t', '--token', type=str, help='Access token to include in Authorization header as Bearer token')
     parser.add_argument('-H', '--host', type=str, help='Custom Host header value')
     parser.add_argument('--swagger-file', type=str, default="swagger.json", help='Path to the Swagger JSON file')
     parser.add_argument('--output-dir', type=str, default="burp_requests", help='Directory to save Burp request files')
     parser.add_argument('--proxy', type=str, help='Proxy URL for sending requests to Burp Suite (e.g., http://127.0.0.1:8080)')
-    args = parser.parse_args()
+    parser.add_argument('--compact', action='store_true', help='Load the spec in memory-compact form (drops descriptions, examples and x- extensions)')
+    parser.add_argument('--compact-cache', action='store_true', help='Like --compact, and reuse a memory-mapped binary form of the spec across runs')
+    parser.add_argument('--workers', type=int, help='Worker processes for rendering large specs (default: number of CPUs)')
+    args = parser.parse_args(argv)
+
+    main(args.swagger_file, args.output_dir, args.token, args.host, args.proxy, args.compact, args.compact_cache, args.workers)
 
-    main(args.swagger_file, args.output_dir, args.token, args.host, args.proxy)
+if __name__ == "__main__":
+    cli()
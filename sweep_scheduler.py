@@ -0,0 +1,238 @@
+import heapq
+import json
+import os
+import queue
+import re
+import threading
+import time
+from urllib.parse import urlparse
+
+from spec_cache import cache_dir
+
+# (substring of the lowercased URL path, likelihood that it serves a spec)
+SPEC_PATH_HINTS = (
+    ("swagger.json", 1.0),
+    ("openapi.json", 1.0),
+    ("api-docs", 0.9),
+    ("swagger.yaml", 0.8),
+    ("openapi.yaml", 0.8),
+    ("swagger", 0.6),
+    ("openapi", 0.6),
+    (".json", 0.4),
+)
+DEFAULT_LIKELIHOOD = 0.2
+
+_NUMBER = re.compile(r"\d+")
+
+def path_pattern(url):
+    """Generalize a URL path for hit statistics: /v2/api-docs -> /v{n}/api-docs."""
+    return _NUMBER.sub("{n}", urlparse(url).path.lower()) or "/"
+
+def spec_likelihood(url):
+    """Prior likelihood that url serves a spec, from its path alone."""
+    path = urlparse(url).path.lower()
+    for hint, likelihood in SPEC_PATH_HINTS:
+        if hint in path:
+            return likelihood
+    return DEFAULT_LIKELIHOOD
+
+class HitHistory:
+    """Per-host and per-path-pattern [hits, tries] counts kept across runs.
+
+    Stored as JSON in ~/.cache/rest-api-scanning/history/sweep.json unless
+    another path is given.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(cache_dir("history"), "sweep.json")
+        self.hosts = {}
+        self.patterns = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.hosts = data.get("hosts", {})
+            self.patterns = data.get("patterns", {})
+        except (OSError, ValueError):
+            pass
+
+    def record(self, url, hit):
+        for table, key in ((self.hosts, urlparse(url).netloc), (self.patterns, path_pattern(url))):
+            counts = table.setdefault(key, [0, 0])
+            counts[0] += int(hit)
+            counts[1] += 1
+
+    def host_rate(self, url):
+        """Smoothed hit rate of url's host (0.5 when never seen)."""
+        hits, tries = self.hosts.get(urlparse(url).netloc, (0, 0))
+        return (hits + 1) / (tries + 2)
+
+    def pattern_rate(self, url, prior):
+        """Hit rate of url's path pattern, starting from prior when never seen."""
+        hits, tries = self.patterns.get(path_pattern(url), (0, 0))
+        return (hits + 2 * prior) / (tries + 2)
+
+    def save(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"hosts": self.hosts, "patterns": self.patterns}, f)
+        os.replace(tmp_path, self.path)
+
+def score(url, history=None):
+    """Priority of url: spec-path likelihood adjusted by past hit rates."""
+    likelihood = spec_likelihood(url)
+    if history is None:
+        return likelihood
+    return history.pattern_rate(url, likelihood) * (0.5 + history.host_rate(url))
+
+class SweepScheduler:
+    """Hand out sweep targets best-first while spreading work across hosts.
+
+    Each host has its own queue ordered by score() and at most per_host
+    requests in flight, started at least host_delay seconds apart. Workers
+    always take the best head among hosts that are free right now, so a
+    host that is busy or cooling down never idles a worker that could serve
+    another host. Without prioritize, every URL scores the same and hosts
+    are served in file order.
+
+    A host that never answered in its first max_host_failures requests is
+    demoted behind every other host; its URLs are still tried last.
+    """
+
+    def __init__(self, targets, history=None, per_host=1, host_delay=0.0, prioritize=True,
+                 max_host_failures=2, clock=time.monotonic):
+        self.history = history
+        self.per_host = per_host
+        self.host_delay = host_delay
+        self.max_host_failures = max_host_failures
+        self.clock = clock
+        self._pending = {}
+        for index, url in enumerate(targets):
+            priority = score(url, history) if prioritize else 0.0
+            heapq.heappush(self._pending.setdefault(urlparse(url).netloc, []), (-priority, index, url))
+        self._remaining = len(targets)
+        self._in_flight = dict.fromkeys(self._pending, 0)
+        self._next_start = dict.fromkeys(self._pending, 0.0)
+        self._demoted = set()
+        self._failures = dict.fromkeys(self._pending, 0)
+        self._alive = set()
+        # A host sits in at most one of _ready / _cooling; _version invalidates stale entries
+        self._version = dict.fromkeys(self._pending, 0)
+        self._queued = set()
+        self._ready = []
+        self._cooling = []
+        self._stopped = False
+        self._cond = threading.Condition()
+        for host in self._pending:
+            self._enqueue(host)
+
+    def __len__(self):
+        return self._remaining
+
+    def _enqueue(self, host):
+        """Queue host if it has work and a free slot; caller holds the lock."""
+        if host in self._queued or not self._pending[host] or self._in_flight[host] >= self.per_host:
+            return
+        self._version[host] += 1
+        self._queued.add(host)
+        if self._next_start[host] > self.clock():
+            heapq.heappush(self._cooling, (self._next_start[host], self._version[host], host))
+        else:
+            head_priority, head_index, _ = self._pending[host][0]
+            heapq.heappush(self._ready, (host in self._demoted, head_priority, head_index, self._version[host], host))
+
+    def _requeue(self, host):
+        self._queued.discard(host)
+        self._enqueue(host)
+
+    def _take(self):
+        """Pop the best available URL, or return the seconds to wait; caller holds the lock."""
+        now = self.clock()
+        while self._cooling and self._cooling[0][0] <= now:
+            _, version, host = heapq.heappop(self._cooling)
+            if version == self._version[host]:
+                self._queued.discard(host)
+                self._enqueue(host)
+        while self._ready:
+            _, _, _, version, host = heapq.heappop(self._ready)
+            if version != self._version[host]:
+                continue
+            self._queued.discard(host)
+            _, _, url = heapq.heappop(self._pending[host])
+            self._remaining -= 1
+            self._in_flight[host] += 1
+            self._next_start[host] = now + self.host_delay
+            self._enqueue(host)
+            return url
+        return self._cooling[0][0] - now if self._cooling else None
+
+    def next(self):
+        """Block until a URL may be started; returns None when nothing is left."""
+        with self._cond:
+            while not self._stopped and self._remaining:
+                taken = self._take()
+                if isinstance(taken, str):
+                    # Another waiting worker may be able to start right away too
+                    self._cond.notify()
+                    return taken
+                self._cond.wait(taken)
+            return None
+
+    def release(self, url):
+        """Mark url's request as finished, freeing its host slot."""
+        host = urlparse(url).netloc
+        with self._cond:
+            self._in_flight[host] -= 1
+            self._requeue(host)
+            self._cond.notify_all()
+
+    def complete(self, url, reachable, found):
+        """Feed back the outcome of url: whether its host answered at all, and whether it was a hit."""
+        host = urlparse(url).netloc
+        if self.history is not None:
+            self.history.record(url, found)
+        with self._cond:
+            if reachable:
+                self._alive.add(host)
+                self._failures[host] = 0
+            elif host not in self._alive:
+                self._failures[host] += 1
+                if self._failures[host] >= self.max_host_failures and host not in self._demoted:
+                    self._demoted.add(host)
+                    self._requeue(host)
+
+    def stop(self):
+        """Stop handing out URLs; requests already started still finish."""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+
+    def run(self, fn, workers=8):
+        """Run fn(url) on worker threads and yield (url, result, error) as each finishes."""
+        results = queue.Queue()
+
+        def worker():
+            while True:
+                url = self.next()
+                if url is None:
+                    break
+                try:
+                    result, error = fn(url), None
+                except Exception as e:
+                    result, error = None, e
+                self.release(url)
+                results.put((url, result, error))
+            results.put(None)
+
+        threads = [threading.Thread(target=worker, daemon=True) for _ in range(max(1, workers))]
+        for thread in threads:
+            thread.start()
+        running = len(threads)
+        try:
+            while running:
+                item = results.get()
+                if item is None:
+                    running -= 1
+                else:
+                    yield item
+        finally:
+            self.stop()
@@ -0,0 +1,33 @@
+import copy
+
+from spec_diff import diff_specs
+
+def _body(ref):
+    return {
+        "requestBody": {"content": {"application/json": {"schema": {"$ref": ref}}}},
+        "responses": {"200": {"description": "ok"}},
+    }
+
+MUTUAL = {
+    "openapi": "3.0.0",
+    "info": {"title": "mutual", "version": "1"},
+    "paths": {
+        "/b": {"post": _body("#/components/schemas/B")},
+        "/a": {"post": _body("#/components/schemas/A")},
+    },
+    "components": {"schemas": {
+        "A": {"type": "object", "properties": {"b": {"$ref": "#/components/schemas/B"}}},
+        "B": {"type": "object", "properties": {"a": {"$ref": "#/components/schemas/A"}, "n": {"type": "string"}}},
+    }},
+}
+
+def test_mutual_recursion_change_reaches_every_member():
+    new = copy.deepcopy(MUTUAL)
+    new["components"]["schemas"]["B"]["properties"]["n"]["type"] = "integer"
+    diff = diff_specs(MUTUAL, new)
+    assert diff["changed"] == [(("POST", "/a"), ["body"]), (("POST", "/b"), ["body"])]
+
+def test_mutual_recursion_digest_ignores_traversal_order():
+    reordered = copy.deepcopy(MUTUAL)
+    reordered["paths"] = dict(reversed(list(MUTUAL["paths"].items())))
+    assert diff_specs(MUTUAL, reordered) == {"added": [], "removed": [], "changed": []}
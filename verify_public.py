@@ -0,0 +1,183 @@
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from urllib.parse import urljoin, urlparse
+
+from multi_identity import auth_header_names, collect_operations
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+LOGIN_MARKERS = ("login", "signin", "sign-in", "auth", "sso", "oauth", "saml", "session")
+
+def probe_base_url(spec_data, spec_url):
+    """Return the origin + base path to probe for a spec downloaded from spec_url.
+
+    Probes always go to the host the spec was served from, never to a host
+    named inside the spec. For OpenAPI 3 the path of the first server entry
+    is used as prefix (Swagger 2 basePath is already part of each operation).
+    """
+    parsed = urlparse(spec_url)
+    origin = f"{parsed.scheme}://{parsed.netloc}"
+    servers = spec_data.get("servers") or []
+    if servers and isinstance(servers[0], dict) and servers[0].get("url"):
+        server_path = urlparse(urljoin(spec_url, servers[0]["url"])).path
+        return origin + server_path.rstrip('/')
+    return origin
+
+def classify(status_code, location=""):
+    """Classify an unauthenticated response."""
+    if 200 <= status_code < 300:
+        return "open"
+    if status_code in (401, 403):
+        return "auth"
+    if 300 <= status_code < 400:
+        if any(marker in location.lower() for marker in LOGIN_MARKERS):
+            return "login-redirect"
+        return "redirect"
+    if status_code in (404, 405):
+        return "not-found"
+    return "error"
+
+def build_probes(spec_data, spec_url, methods=SAFE_METHODS):
+    """Build minimal credential-less probes for every operation with an allowed method.
+
+    Header parameters that carry credentials (Authorization, apiKey scheme
+    headers, Cookie) are never sent, not even as placeholders.
+    """
+    base_url = probe_base_url(spec_data, spec_url)
+    credential_headers = auth_header_names(spec_data) | {"cookie"}
+    probes = []
+    for op in collect_operations(spec_data):
+        if op["method"] not in methods:
+            continue
+        probes.append({
+            "method": op["method"],
+            "path": op["path"],
+            "url": base_url + op["request_path"],
+            "headers": {name: value for name, value in op["headers"].items() if name.lower() not in credential_headers},
+            "body": op["body"],
+        })
+    return probes
+
+class PublicVerifier:
+    """Fire credential-less probes at bounded global and per-host concurrency.
+
+    Probes wait in per-host queues and are handed to the worker pool only
+    while their host has fewer than per_host in flight, so workers never
+    block on a busy host and one large spec does not hold up the probes
+    of every other host. After max_host_errors consecutive connection
+    failures or 429 responses from a host, its remaining probes are skipped.
+    """
+
+    def __init__(self, workers=32, per_host=4, timeout=5, max_host_errors=3, methods=SAFE_METHODS, session=None):
+        self.per_host = per_host
+        self.timeout = timeout
+        self.max_host_errors = max_host_errors
+        self.methods = tuple(m.upper() for m in methods)
+        self.session = session or self._create_session(workers, per_host)
+        self._pool = ThreadPoolExecutor(max_workers=workers)
+        self._pending = {}
+        self._in_flight = {}
+        self._host_errors = {}
+        self._closed = False
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _create_session(workers, per_host):
+        from requests.adapters import HTTPAdapter
+
+        from api_endpoints_without_auth import create_session
+
+        session = create_session()
+        adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=per_host)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def _record(self, host, failed):
+        with self._lock:
+            self._host_errors[host] = self._host_errors.get(host, 0) + 1 if failed else 0
+
+    def _aborted(self, host):
+        with self._lock:
+            return self._host_errors.get(host, 0) >= self.max_host_errors
+
+    def _dispatch(self, host):
+        """Start queued probes for host while it has free slots; caller holds the lock."""
+        queue = self._pending[host]
+        while queue and self._in_flight[host] < self.per_host and not self._closed:
+            probe, future = queue.popleft()
+            self._in_flight[host] += 1
+            self._pool.submit(self._run, host, probe, future)
+
+    def _run(self, host, probe, future):
+        try:
+            future.set_result(self.probe(probe))
+        except Exception as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                self._in_flight[host] -= 1
+                self._dispatch(host)
+
+    def probe(self, probe):
+        """Send one probe without credentials and return its classified result."""
+        host = urlparse(probe["url"]).netloc
+        result = {"method": probe["method"], "path": probe["path"], "url": probe["url"]}
+        if self._aborted(host):
+            result.update(status=None, classification="skipped")
+            return result
+        try:
+            response = self.session.request(probe["method"], probe["url"], headers=probe["headers"],
+                                            data=probe["body"], timeout=self.timeout, verify=False,
+                                            allow_redirects=False, stream=True)
+            response.close()
+        except Exception as e:
+            self._record(host, True)
+            result.update(status=None, classification="error", error=str(e))
+            return result
+        self._record(host, response.status_code == 429)
+        result.update(status=response.status_code,
+                      classification=classify(response.status_code, response.headers.get("Location", "")))
+        return result
+
+    def submit(self, spec_data, spec_url):
+        """Queue all probes for a spec; returns a list of futures of probe results."""
+        # Build the probes before taking the lock: workers finishing probes need it meanwhile
+        queued = [(urlparse(probe["url"]).netloc, probe, Future())
+                  for probe in build_probes(spec_data, spec_url, self.methods)]
+        with self._lock:
+            for host, probe, future in queued:
+                self._pending.setdefault(host, deque()).append((probe, future))
+                self._in_flight.setdefault(host, 0)
+            for host in {host for host, _, _ in queued}:
+                self._dispatch(host)
+        return [future for _, _, future in queued]
+
+    def verify(self, spec_data, spec_url):
+        """Probe a spec and wait for all results."""
+        return [future.result() for future in self.submit(spec_data, spec_url)]
+
+    def shutdown(self):
+        """Cancel probes that have not started, wait for the rest and close the session."""
+        with self._lock:
+            self._closed = True
+            for queue in self._pending.values():
+                while queue:
+                    queue.popleft()[1].cancel()
+        self._pool.shutdown(wait=True)
+        self.session.close()
+
+def format_verification(results, declared_public=()):
+    """Format probe results, marking declared-protected endpoints that answered without auth."""
+    declared = set(declared_public)
+    lines = ["  Verified without credentials:"]
+    if not results:
+        lines.append("    No probes sent (no operations with allowed methods).")
+    for r in results:
+        status = r["status"] if r["status"] is not None else "-"
+        flag = ""
+        if r["classification"] == "open" and (r["method"], r["path"]) not in declared:
+            flag = "  <- declared protected"
+        lines.append(f"    {r['method']} {r['path']} -> {status} {r['classification']}{flag}")
+    return "\n".join(lines)
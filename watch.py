@@ -0,0 +1,335 @@
+# python3 watch.py -f urls.txt --events events.jsonl
+# python3 watch.py -f urls.txt --webhook http://127.0.0.1:9000/events --min-interval 60 --max-interval 86400
+
+import argparse
+import heapq
+import json
+import os
+import random
+import signal
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+
+from api_endpoints_without_auth import detect_public_endpoints, parse_swagger
+from spec_cache import SpecCache, cache_dir, spec_digest
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+# Statuses that mean the spec is gone rather than temporarily unavailable
+GONE_STATUSES = (404, 410)
+
+def read_urls(file_path):
+    """Read and normalize the URL list, keeping file order and dropping duplicates."""
+    urls = []
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            url = line.strip()
+            if not url or url.startswith('#'):
+                continue
+            if not url.startswith(('http://', 'https://')):
+                url = 'https://' + url
+            urls.append(url)
+    return list(dict.fromkeys(urls))
+
+class EventSink:
+    """Write change events as JSON lines to a file/stdout and/or POST them to a webhook."""
+
+    def __init__(self, stream=None, webhook=None, session=None):
+        self.stream = stream
+        self.webhook = webhook
+        self.session = session
+        self.count = 0
+
+    def emit(self, event, url, **fields):
+        record = {"time": datetime.now(timezone.utc).isoformat(timespec="seconds"), "event": event, "url": url, **fields}
+        self.count += 1
+        if self.stream is not None:
+            self.stream.write(json.dumps(record) + "\n")
+            self.stream.flush()
+        if self.webhook:
+            try:
+                self.session.post(self.webhook, json=record, timeout=10)
+            except Exception as e:
+                print(f"Error posting event to {self.webhook}: {e}", file=sys.stderr)
+
+class Watcher:
+    """Re-check spec URLs on per-URL adaptive intervals and emit change events.
+
+    URLs sit in a heap ordered by their next due time. Each check is a
+    conditional GET (ETag / Last-Modified) on the shared pooled session; a
+    304 or an unchanged body digest costs no parsing. An unchanged check
+    stretches that URL's interval by `backoff` up to max_interval, and a
+    change shrinks it back towards min_interval. Stable specs therefore
+    fade into the background, and steady-state work follows the change
+    rate, not the list size.
+
+    Per-URL state (validators, digest, public endpoints, interval) is kept
+    in a JSON state file, so a restart does not re-announce every endpoint.
+    """
+
+    def __init__(self, sink, session, interval=300, min_interval=60, max_interval=86400, backoff=1.5,
+                 workers=8, timeout=10, state_path=None, spec_cache=None, clock=time.time):
+        self.sink = sink
+        self.session = session
+        self.interval = interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.workers = workers
+        self.timeout = timeout
+        self.state_path = state_path
+        self.spec_cache = spec_cache or SpecCache()
+        self.clock = clock
+        self.state = {}
+        self.checks = 0
+        self._queue = []
+        self._in_flight = set()  # URLs being fetched; run() reschedules them when done
+        self._stop = threading.Event()
+        self._dirty = False
+        if state_path and os.path.exists(state_path):
+            try:
+                with open(state_path, 'r', encoding='utf-8') as f:
+                    self.state = json.load(f)
+            except (OSError, ValueError):
+                self.state = {}
+
+    def set_urls(self, urls):
+        """Start watching new URLs (due now) and forget the ones no longer listed."""
+        now = self.clock()
+        listed = set(urls)
+        for url in [url for url in self.state if url not in listed]:
+            del self.state[url]
+            self._dirty = True
+        self._queue = [item for item in self._queue if item[1] in listed]
+        heapq.heapify(self._queue)
+        queued = {item[1] for item in self._queue} | self._in_flight
+        for url in urls:
+            if url in queued:
+                continue
+            entry = self.state.setdefault(url, {"interval": self.interval})
+            heapq.heappush(self._queue, (entry.get("next_check", now), url))
+
+    def _fetch(self, url):
+        """Conditional GET of url; runs on a worker thread. Returns (status, content, headers) or an exception."""
+        entry = self.state.get(url, {})
+        headers = {"User-Agent": USER_AGENT}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        try:
+            response = self.session.get(url, headers=headers, timeout=self.timeout, verify=False)
+        except Exception as e:
+            return e
+        return response.status_code, response.content, response.headers
+
+    def _analyze(self, content, url):
+        """Return (digest, sorted public endpoints), with None endpoints when the body is not a usable spec."""
+        digest = spec_digest(content)
+        entry = self.spec_cache.get(digest)
+        if entry is None:
+            spec_data = parse_swagger(content, url)
+            endpoints = None
+            if isinstance(spec_data, dict) and isinstance(spec_data.get("paths"), dict):
+                # A malformed or hostile spec must not take the daemon down
+                try:
+                    endpoints = sorted(" ".join(e) for e in detect_public_endpoints(spec_data))
+                except Exception as e:
+                    print(f"Error analyzing spec from {url}: {e}", file=sys.stderr)
+            entry = (spec_data, endpoints)
+            self.spec_cache.put(digest, entry)
+        return digest, entry[1]
+
+    def _update(self, url, result):
+        """Apply one check result to url's state and emit events; returns True if something changed."""
+        entry = self.state[url]
+        changed = False
+        if isinstance(result, Exception):
+            entry["failures"] = entry.get("failures", 0) + 1
+            # Connection failures only count as removal once they persist
+            if entry.get("present") and entry["failures"] == 3:
+                self.sink.emit("spec_removed", url, reason=f"unreachable: {result}")
+                entry["present"] = False
+                changed = True
+            return changed
+
+        status, content, headers = result
+        entry["failures"] = 0
+        if status == 304:
+            return False
+        if status in GONE_STATUSES or status >= 400:
+            if entry.get("present") and status in GONE_STATUSES:
+                self.sink.emit("spec_removed", url, reason=str(status))
+                entry["present"] = False
+                changed = True
+            return changed
+
+        entry["etag"] = headers.get("ETag")
+        entry["last_modified"] = headers.get("Last-Modified")
+        digest, endpoints = self._analyze(content, url)
+        if digest == entry.get("digest") and entry.get("present"):
+            return False
+        if endpoints is None:
+            # Not a spec (any more): treat like a removal if it was one
+            if entry.get("present"):
+                self.sink.emit("spec_removed", url, reason="unparseable")
+                entry["present"] = False
+                changed = True
+            entry["digest"] = digest
+            return changed
+
+        previous = set(entry.get("endpoints", []))
+        if not entry.get("present"):
+            self.sink.emit("spec_found", url, public_endpoints=endpoints)
+        else:
+            for endpoint in endpoints:
+                if endpoint not in previous:
+                    method, path = endpoint.split(" ", 1)
+                    self.sink.emit("public_endpoint_added", url, method=method, path=path)
+            for endpoint in sorted(previous - set(endpoints)):
+                method, path = endpoint.split(" ", 1)
+                self.sink.emit("public_endpoint_removed", url, method=method, path=path)
+            self.sink.emit("spec_changed", url, digest=digest)
+        entry.update(present=True, digest=digest, endpoints=endpoints)
+        return True
+
+    def _reschedule(self, url, changed):
+        entry = self.state[url]
+        interval = entry.get("interval", self.interval)
+        if changed:
+            interval = max(self.min_interval, interval / 2)
+        elif entry.get("failures"):
+            interval = min(self.max_interval, interval * 2)
+        else:
+            interval = min(self.max_interval, interval * self.backoff)
+        entry["interval"] = interval
+        # Jitter keeps URLs that were added together from staying in lockstep
+        entry["next_check"] = self.clock() + interval * random.uniform(0.9, 1.1)
+        heapq.heappush(self._queue, (entry["next_check"], url))
+
+    def save_state(self):
+        if not self.state_path or not self._dirty:
+            return
+        tmp_path = self.state_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f)
+        os.replace(tmp_path, self.state_path)
+        self._dirty = False
+
+    def run(self, once=False, reload=None):
+        """Check URLs as they fall due until stop() is called.
+
+        With once, every URL is checked a single time and run() returns.
+        reload is called between checks and may return a new URL list.
+        """
+        pool = ThreadPoolExecutor(max_workers=self.workers)
+        in_flight = {}
+        budget = len(self._queue) if once else None
+        try:
+            while not self._stop.is_set():
+                urls = reload() if reload else None
+                if urls is not None:
+                    self.set_urls(urls)
+
+                now = self.clock()
+                while self._queue and len(in_flight) < self.workers and (once or self._queue[0][0] <= now):
+                    if budget is not None:
+                        if budget == 0:
+                            break
+                        budget -= 1
+                    _, url = heapq.heappop(self._queue)
+                    if url in self.state:
+                        in_flight[pool.submit(self._fetch, url)] = url
+                        self._in_flight.add(url)
+
+                if once and budget == 0 and not in_flight:
+                    break
+                if not in_flight:
+                    delay = self._queue[0][0] - now if self._queue else 1.0
+                    self._stop.wait(min(max(delay, 0.05), 1.0))
+                    continue
+
+                done, _ = wait(in_flight, timeout=1.0, return_when=FIRST_COMPLETED)
+                for future in done:
+                    url = in_flight.pop(future)
+                    self._in_flight.discard(url)
+                    self.checks += 1
+                    if url not in self.state:
+                        continue
+                    changed = self._update(url, future.result())
+                    self._reschedule(url, changed)
+                    # Only changes rewrite the state file
+                    self._dirty = True
+                    if changed:
+                        self.save_state()
+        finally:
+            pool.shutdown(wait=True)
+            self._dirty = True
+            self.save_state()
+
+    def stop(self):
+        self._stop.set()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Continuously monitor Swagger/OpenAPI URLs and emit change events")
+    parser.add_argument('-f', '--file', required=True, help='File containing URLs to watch (re-read when it changes)')
+    parser.add_argument('--events', default='-', help='JSONL file to append events to (default: stdout)')
+    parser.add_argument('--webhook', help='URL to POST each event to as JSON')
+    parser.add_argument('--interval', type=float, default=300, help='Initial re-check interval in seconds (default: 300)')
+    parser.add_argument('--min-interval', type=float, default=60, help='Shortest re-check interval (default: 60)')
+    parser.add_argument('--max-interval', type=float, default=86400, help='Longest re-check interval (default: 86400)')
+    parser.add_argument('--workers', type=int, default=8, help='Concurrent checks (default: 8)')
+    parser.add_argument('--timeout', type=float, default=10, help='Timeout in seconds for each check (default: 10)')
+    parser.add_argument('--state', help='State file (default: ~/.cache/rest-api-scanning/watch/state.json)')
+    parser.add_argument('--once', action='store_true', help='Check every URL once, emit events and exit')
+    args = parser.parse_args(argv)
+
+    from requests.adapters import HTTPAdapter
+
+    from api_endpoints_without_auth import create_session
+
+    session = create_session()
+    adapter = HTTPAdapter(pool_connections=256, pool_maxsize=args.workers)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    stream = sys.stdout if args.events == '-' else open(args.events, 'a', encoding='utf-8')
+    sink = EventSink(stream, args.webhook, session)
+    watcher = Watcher(sink, session, args.interval, args.min_interval, args.max_interval,
+                      workers=args.workers, timeout=args.timeout,
+                      state_path=args.state or os.path.join(cache_dir("watch"), "state.json"))
+
+    mtime = [None]
+
+    def reload():
+        try:
+            current = os.stat(args.file).st_mtime_ns
+        except OSError:
+            return None
+        if current == mtime[0]:
+            return None
+        mtime[0] = current
+        return read_urls(args.file)
+
+    urls = reload()
+    if urls is None:
+        print(f"Error: File {args.file} not found")
+        sys.exit(1)
+    watcher.set_urls(urls)
+
+    # Daemon managers stop with SIGTERM: finish in-flight checks and save state
+    signal.signal(signal.SIGTERM, lambda signum, frame: watcher.stop())
+    try:
+        watcher.run(once=args.once, reload=None if args.once else reload)
+    except KeyboardInterrupt:
+        watcher.stop()
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+    print(f"{watcher.checks} check(s), {sink.count} event(s)", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()